@@ -0,0 +1,195 @@
+from scrapers.nba_scraper.html_parser import parse_schedule_file
+from scrapers.nba_scraper.feed import feed_to_schedule_days, load_feed_file
+from scrapers.nba_scraper.parsing import build_games
+from scrapers.nba_scraper.utils import month_num_to_name
+from datetime import date, timedelta
+from html import escape
+import calendar
+import logging
+import random
+import os
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# (time, arena, cidade, estado) usados para montar as páginas sintéticas
+TEAMS = [
+    ("Hawks", "State Farm Arena", "Atlanta", "GA"), ("Celtics", "TD Garden", "Boston", "MA"),
+    ("Nets", "Barclays Center", "Brooklyn", "NY"), ("Hornets", "Spectrum Center", "Charlotte", "NC"),
+    ("Bulls", "United Center", "Chicago", "IL"), ("Cavaliers", "Rocket Arena", "Cleveland", "OH"),
+    ("Mavericks", "American Airlines Center", "Dallas", "TX"), ("Nuggets", "Ball Arena", "Denver", "CO"),
+    ("Pistons", "Little Caesars Arena", "Detroit", "MI"), ("Warriors", "Chase Center", "San Francisco", "CA"),
+    ("Rockets", "Toyota Center", "Houston", "TX"), ("Pacers", "Gainbridge Fieldhouse", "Indianapolis", "IN"),
+    ("Clippers", "Intuit Dome", "Inglewood", "CA"), ("Lakers", "Crypto.com Arena", "Los Angeles", "CA"),
+    ("Grizzlies", "FedExForum", "Memphis", "TN"), ("Heat", "Kaseya Center", "Miami", "FL"),
+    ("Bucks", "Fiserv Forum", "Milwaukee", "WI"), ("Timberwolves", "Target Center", "Minneapolis", "MN"),
+    ("Pelicans", "Smoothie King Center", "New Orleans", "LA"), ("Knicks", "Madison Square Garden", "New York", "NY"),
+    ("Thunder", "Paycom Center", "Oklahoma City", "OK"), ("Magic", "Kia Center", "Orlando", "FL"),
+    ("76ers", "Wells Fargo Center", "Philadelphia", "PA"), ("Suns", "Footprint Center", "Phoenix", "AZ"),
+    ("Trail Blazers", "Moda Center", "Portland", "OR"), ("Kings", "Golden 1 Center", "Sacramento", "CA"),
+    ("Spurs", "Frost Bank Center", "San Antonio", "TX"), ("Raptors", "Scotiabank Arena", "Toronto", "ON"),
+    ("Jazz", "Delta Center", "Salt Lake City", "UT"), ("Wizards", "Capital One Arena", "Washington", "DC"),
+]
+BROADCASTERS = ["ESPN", "TNT", "ABC", "NBA TV", None, ""]
+
+
+def _game_spec(rng, day, today):
+    away, home = rng.sample(TEAMS, 2)
+    if day < today:
+        time, scores = None, [rng.randint(85, 140) for _ in range(2)]
+    else:
+        time, scores = f"{rng.randint(6, 10)}:{rng.choice(['00', '30'])}", []
+    return {"away": away, "home": home, "time": time, "scores": scores, "broadcaster": rng.choice(BROADCASTERS)}
+
+
+def _game_html(game):
+    away, home, broadcaster = game["away"], game["home"], game["broadcaster"]
+    status = f"{game['time']} PM ET" if game["time"] else "FINAL"
+    scores = "".join(f'<div class="ScheduleGame_sgScore__x"><span>{score}</span></div>' for score in game["scores"])
+
+    if broadcaster is None:
+        broadcasters = ""
+    elif broadcaster == "":
+        broadcasters = '<div class="ScheduleGame_sgBroadcasters__x"></div>'  # Sem <p>: "NBA League Pass"
+    else:
+        broadcasters = (f'<div class="ScheduleGame_sgBroadcasters__x">'
+                        f'<p class="Broadcaster_x">{escape(broadcaster)}</p></div>')
+
+    teams = "".join(
+        f'<div class="ScheduleGame_sgTeam__x"><img alt=""/><a href="#">{escape(team[0])}</a></div>'
+        for team in (away, home)
+    )
+    return (
+        '<div class="ScheduleGame_sg__x">'
+        f'<div class="ScheduleGame_sgStatus__x"><span class="ScheduleStatusText_x">{status}</span></div>'
+        f'{broadcasters}{teams}{scores}'
+        '<div class="ScheduleGame_sgLocation__x"><div class="ScheduleGame_sgLocationInner__x">'
+        f'<div>{escape(home[1])}</div><div>{escape(home[2])}, {home[3]}</div>'
+        '</div></div></div>'
+    )
+
+
+def _game_feed(game):
+    away, home, broadcaster = game["away"], game["home"], game["broadcaster"]
+    final = game["time"] is None
+    away_score, home_score = game["scores"] or [0, 0]
+    return {
+        "gameStatus": 3 if final else 1,
+        "gameStatusText": "Final" if final else f"{game['time']} pm ET",
+        "arenaName": home[1], "arenaCity": home[2], "arenaState": home[3],
+        "broadcasters": {"nationalBroadcasters": [{"broadcasterDisplay": broadcaster}] if broadcaster else []},
+        "homeTeam": {"teamName": home[0], "score": home_score},
+        "awayTeam": {"teamName": away[0], "score": away_score},
+    }
+
+
+def _schedule_specs(days, today, seed):
+    rng = random.Random(seed)
+    return [(day, [_game_spec(rng, day, today) for _ in range(games)]) for day, games in days]
+
+
+def schedule_page(days, today=None, seed=0):
+    """
+    Monta uma página de programação no mesmo formato de classes CSS da nba.com.
+
+    Parâmetros:
+        days (list): Pares (date, número de jogos) a incluir na página.
+        today (date, opcional): Dias anteriores viram jogos encerrados ("FINAL", com placar).
+        seed (int): Semente para que a página seja sempre a mesma.
+
+    Retorno:
+        str: HTML da página.
+    """
+    blocks = []
+    for day, games in _schedule_specs(days, today or date.today(), seed):
+        heading = f"{day:%A}, {day:%B} {day.day}"
+        games_html = "".join(_game_html(game) for game in games)
+        blocks.append(
+            '<div class="ScheduleDay_sd_x">'
+            f'<h4 class="ScheduleDay_sdDay__x">{heading}</h4>'
+            f'<div class="ScheduleDay_sdGames__x">{games_html}</div></div>'
+        )
+    return f'<!DOCTYPE html><html><head><title>NBA Schedule</title></head><body>{"".join(blocks)}</body></html>'
+
+
+def schedule_feed(days, today=None, seed=0):
+    """
+    Monta o feed JSON da temporada com os mesmos jogos de `schedule_page` para a
+    mesma semente (a emissora ausente da página vira "NBA League Pass" no feed).
+
+    Retorno:
+        dict: Feed no formato `{"leagueSchedule": {"gameDates": [...]}}`.
+    """
+    return {"leagueSchedule": {"gameDates": [
+        {"gameDate": f"{day:%m/%d/%Y} 00:00:00", "games": [_game_feed(game) for game in games]}
+        for day, games in _schedule_specs(days, today or date.today(), seed)
+    ]}}
+
+
+def synthetic_scenarios(today=None):
+    """
+    Cenários sintéticos em janeiro do ano atual. O ano precisa ser o atual (ou o
+    anterior) porque `format_date` deduz o ano a partir do dia da semana; o mês é
+    fixo para que o número de jogos seja sempre o mesmo e comparável com a baseline.
+
+    Retorno:
+        dict: nome -> {"html": str, "feed": dict, "date": "YYYY-MM-DD", "month": nome do mês}.
+    """
+    today = today or date.today()
+    first = date(today.year, 1, 1)
+    target = date(today.year, 1, 15)
+    month_days = calendar.monthrange(first.year, first.month)[1]
+    rng = random.Random(42)
+    month = [(first + timedelta(days=offset), rng.randint(4, 15)) for offset in range(month_days)]
+    pages = {
+        "light_night": ([(target, 3)], 1),
+        "full_night": ([(target, 15)], 2),
+        "full_month": (month, 3),
+    }
+    return {
+        name: {"html": schedule_page(days, today, seed=seed), "feed": schedule_feed(days, today, seed=seed),
+               "date": target.strftime("%Y-%m-%d"), "month": month_num_to_name(first.month)}
+        for name, (days, seed) in pages.items()
+    }
+
+
+def recorded_scenarios(directory=FIXTURES_DIR, timezone=None):
+    """
+    Cenários a partir de páginas reais gravadas em `fixtures/*.html` (por ex:
+    snapshots salvos com SCRAPER_SNAPSHOT_DIR) e de feeds JSON salvos em `fixtures/*.json`.
+
+    A data consultada é o dia com mais jogos do arquivo.
+
+    Retorno:
+        dict: nome do arquivo -> {"html": str | None, "feed": dict | None,
+        "date": "YYYY-MM-DD", "month": nome do mês}.
+    """
+    scenarios = {}
+    if not os.path.isdir(directory):
+        return scenarios
+    for filename in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(filename)
+        path = os.path.join(directory, filename)
+        if extension == ".html":
+            html, feed = None, None
+            games_by_date = build_games(parse_schedule_file(path), timezone=timezone)
+        elif extension == ".json":
+            html, feed = None, load_feed_file(path)
+            games_by_date = build_games(feed_to_schedule_days(feed))
+        else:
+            continue
+        if not games_by_date:
+            logger.warning("Fixture sem jogos reconhecidos, ignorada: %s", filename)
+            continue
+        target = max(games_by_date, key=lambda full_date: len(games_by_date[full_date]))
+        if extension == ".html":
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+        scenarios[f"recorded_{name}"] = {
+            "html": html,
+            "feed": feed,
+            "date": target,
+            "month": month_num_to_name(int(target[5:7])),
+        }
+    return scenarios
@@ -0,0 +1,294 @@
+"""
+Benchmark reproduzível do scraper, sem acessar a nba.com.
+
+Páginas de programação gravadas (ou sintéticas) são servidas por um servidor HTTP
+local e `const.BASE_URL` é apontado para ele. Para cada cenário são medidos:
+
+- offline: `parse_schedule_html` + `build_games` + validação, sem navegador;
+- feed_offline: `feed_to_schedule_days` + `build_games` + validação, para o feed JSON;
+- browser: `scrape_nba_task` em cada modo de extração (no modo "feed" o feed é
+  servido pelo mesmo servidor local e nenhum navegador é iniciado), com o tempo de cada etapa
+  (launch, navigation, wait, day_scan, game_extraction, extraction, validation,
+  teardown), o tempo total e o pico de RSS somando o Python e os processos filhos
+  (chromedriver e Chrome). Com o perfil "lean", também os bytes transferidos e as
+  requisições bloqueadas por carregamento.
+
+Uso (a partir do diretório `app`):
+    python -m benchmarks.run                      # todos os cenários e modos
+    python -m benchmarks.run --offline-only       # sem Chrome
+    python -m benchmarks.run --load-profile full  # página inteira, sem bloqueios
+    python -m benchmarks.run --update-baseline    # grava o resultado como nova referência
+
+A referência (`baseline.json`) guarda tempos absolutos da máquina onde foi gerada, por
+isso não é versionada: gere-a com `--update-baseline` antes das mudanças e compare na
+mesma máquina.
+"""
+from benchmarks.fixtures import synthetic_scenarios, recorded_scenarios
+from scrapers.nba_scraper.load_profile import LoadProfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+from zoneinfo import ZoneInfo
+import scrapers.nba_scraper.constants as const
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+MODES = ("script", "html", "elements", "feed")
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP local que responde `/<cenário>/schedule?...` com o HTML do cenário
+    e `/<cenário>/feed.json` com o feed JSON.
+    """
+
+    def __init__(self, scenarios):
+        self.scenarios = scenarios
+        super().__init__(("127.0.0.1", 0), _FixtureHandler)
+
+    def base_url(self, scenario):
+        return f"http://127.0.0.1:{self.server_address[1]}/{scenario}/schedule?cal=MONTH&region=11&pd=false"
+
+    def feed_url(self, scenario):
+        return f"http://127.0.0.1:{self.server_address[1]}/{scenario}/feed.json"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        scenario = self.server.scenarios.get(parts[0])
+        if scenario is not None and parts[-1] == "feed.json" and scenario.get("feed") is not None:
+            body, content_type = json.dumps(scenario["feed"]).encode("utf-8"), "application/json"
+        elif scenario is not None and parts[-1] == "schedule" and scenario.get("html") is not None:
+            body, content_type = scenario["html"].encode("utf-8"), "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RssSampler:
+    """Amostra o RSS do processo atual somado ao de todos os descendentes (Linux, via /proc)."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+    @staticmethod
+    def _children():
+        children = {}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    # O nome do processo pode conter espaços; o ppid vem logo após o ")"
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(pid))
+        return children
+
+    @staticmethod
+    def _rss_kb(pid):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def sample(self):
+        children = self._children()
+        pending, total = [os.getpid()], 0
+        while pending:
+            pid = pending.pop()
+            total += self._rss_kb(pid)
+            pending.extend(children.get(pid, []))
+        self.peak_kb = max(self.peak_kb, total)
+
+    def _run(self):
+        if not os.path.isdir("/proc"):
+            return
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+
+def bench_offline(scenario, repeat, source="html"):
+    from scrapers.nba_scraper.feed import feed_to_schedule_days
+    from scrapers.nba_scraper.html_parser import parse_schedule_html
+    from scrapers.nba_scraper.parsing import build_games
+    from scrapers.validation.validate_game import validate_games
+
+    tz = ZoneInfo(const.TIMEZONE)
+    month_num = int(scenario["date"][5:7])
+    parse_ms, build_ms, validation_ms = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if source == "feed":
+            schedule_days = feed_to_schedule_days(scenario["feed"], month_num)
+        else:
+            schedule_days = parse_schedule_html(scenario["html"])
+        parsed = time.perf_counter()
+        games_by_date = build_games(schedule_days, timezone=tz)
+        built = time.perf_counter()
+        games = validate_games([game for games in games_by_date.values() for game in games])[0]
+        validated = time.perf_counter()
+        parse_ms.append((parsed - started) * 1000)
+        build_ms.append((built - parsed) * 1000)
+        validation_ms.append((validated - built) * 1000)
+    return {
+        "games": len(games),
+        "stages_ms": {"parse": median(parse_ms), "build": median(build_ms), "validation": median(validation_ms)},
+        "total_ms": median(p + b + v for p, b, v in zip(parse_ms, build_ms, validation_ms)),
+    }
+
+
+def bench_browser(server, name, scenario, mode, repeat, load_profile=None):
+    from scrapers.nba_scraper.feed import schedule_feed
+    from tasks.scraper_task import scrape_nba_task
+    from tasks.timing import ScrapeTimings
+
+    const.BASE_URL = server.base_url(name)
+    schedule_feed.discover(server.feed_url(name))
+    totals, stages, peaks, games, page_load = [], {}, [], 0, None
+    for _ in range(repeat):
+        timings = ScrapeTimings()
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            games = len(scrape_nba_task(scenario["date"], extraction_mode=mode, timings=timings,
+                                        load_profile=load_profile))
+            totals.append((time.perf_counter() - started) * 1000)
+        peaks.append(sampler.peak_kb)
+        page_load = timings.page_load
+        for stage, seconds in timings.stages.items():
+            stages.setdefault(stage, []).append(seconds * 1000)
+
+    result = {
+        "games": games,
+        "stages_ms": {stage: median(values) for stage, values in stages.items()},
+        "total_ms": median(totals),
+        "peak_rss_mb": round(max(peaks) / 1024, 1),
+    }
+    if page_load is not None:
+        result["page_load"] = page_load
+    if games and "game_extraction" in result["stages_ms"]:
+        result["per_game_ms"] = result["stages_ms"]["game_extraction"] / games
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Compara `total_ms` com a referência; retorna a lista de regressões."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        limit = reference["total_ms"] * (1 + tolerance)
+        status = "OK"
+        if result["total_ms"] > limit:
+            status = "REGRESSION"
+            regressions.append(key)
+        if result["games"] != reference["games"]:
+            status = "MISMATCH"
+            regressions.append(key)
+        print(f"{key:<40} {result['total_ms']:>10.1f} ms  (baseline {reference['total_ms']:.1f} ms)  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do NbaScraper com páginas gravadas.")
+    parser.add_argument("--scenario", action="append", help="Cenário a executar (repetível). Padrão: todos.")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Modo de extração (repetível). Padrão: todos.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por medição (mediana).")
+    parser.add_argument("--offline-only", action="store_true", help="Não inicia o Chrome.")
+    parser.add_argument("--load-profile", choices=("lean", "full"), default="lean",
+                        help="Perfil de carregamento do Chrome. Padrão: lean.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Arquivo de referência.")
+    parser.add_argument("--update-baseline", action="store_true", help="Grava os resultados como referência.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Piora tolerada antes de acusar regressão.")
+    parser.add_argument("--output", help="Grava os resultados completos em JSON.")
+    args = parser.parse_args(argv)
+
+    scenarios = synthetic_scenarios() | recorded_scenarios(timezone=ZoneInfo(const.TIMEZONE))
+    if args.scenario:
+        scenarios = {name: scenarios[name] for name in args.scenario}
+
+    results = {}
+    for name, scenario in scenarios.items():
+        if scenario.get("html") is not None:
+            results[f"{name}/offline"] = bench_offline(scenario, args.repeat)
+        if scenario.get("feed") is not None:
+            results[f"{name}/feed_offline"] = bench_offline(scenario, args.repeat, source="feed")
+
+    if not args.offline_only:
+        load_profile = LoadProfile.from_env(args.load_profile)
+        from scrapers.nba_scraper.feed import schedule_feed
+
+        original_base_url, original_feed_url = const.BASE_URL, schedule_feed.url
+        server = FixtureServer(scenarios)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            for name, scenario in scenarios.items():
+                for mode in args.mode or MODES:
+                    if scenario.get("feed" if mode == "feed" else "html") is None:
+                        continue
+                    results[f"{name}/{mode}"] = bench_browser(server, name, scenario, mode, args.repeat,
+                                                              load_profile=load_profile)
+        finally:
+            server.shutdown()
+            const.BASE_URL = original_base_url
+            schedule_feed.discover(original_feed_url)
+
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({key: {"games": r["games"], "total_ms": round(r["total_ms"], 2)} for key, r in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline atualizada: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sem baseline para comparar; rode com --update-baseline para criar uma.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,317 @@
-from fastapi import FastAPI, Request, HTTPException, status, Depends
-from tasks.scraper_task import scrape_nba_task
-from datetime import datetime
+from fastapi import FastAPI, Request, Response, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from tasks.scraper_task import scrape_nba_month, DEFAULT_DEADLINE_SECONDS
+from scrapers.nba_scraper.pool import BrowserPool, PoolTimeoutError
+from scrapers.nba_scraper.nba_scraper import NbaScraper
+from scrapers.nba_scraper.load_profile import LoadProfile
+from scrapers.nba_scraper.feed import schedule_feed
+from scrapers.nba_scraper.utils import get_month_from_date_string, month_num_to_name
+from storage.schedule_cache import ScheduleCache, is_final
+from storage.game_store import GameStore
+from tasks.single_flight import SingleFlight
+from tasks.timing import Deadline, ScrapeTimings, ScrapeTimeoutError
+from tasks.jobs import JobManager, QueueFullError
+from tasks.prefetch import PrefetchScheduler
+from tasks.live import LiveScores
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import scrapers.nba_scraper.constants as const
+from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta
+from functools import partial
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from metrics import REGISTRY, REQUEST_SECONDS, CallbackGauge
+from responses import FORMATS, parse_fields, shape_games, games_response, ndjson_line, sse_event
+from typing import Optional
+import asyncio
+import logging
+import math
 import os
+import socket
+import time
 from dotenv import load_dotenv
 import secrets
 
-app = FastAPI()
-
 load_dotenv('./.env')
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                    format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("nba_bot_api")
+
 API_KEY = os.getenv("API_KEY")
 API_KEY_NAME = "X-API-Key"
 
+# Uvicorn's worker count; BROWSER_POOL_SIZE is the Chrome budget shared by all workers
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+BROWSER_POOL_SIZE = math.ceil(int(os.getenv("BROWSER_POOL_SIZE", "2")) / WEB_CONCURRENCY)
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", "60"))
+# "script", "html", "elements" or "feed" (reads the season's JSON feed instead of the rendered page)
+SCRAPER_EXTRACTION_MODE = os.getenv("SCRAPER_EXTRACTION_MODE", "script")
+SCRAPER_FEED_URL = os.getenv("SCRAPER_FEED_URL")
+SCRAPER_SNAPSHOT_DIR = os.getenv("SCRAPER_SNAPSHOT_DIR")
+# "lean" blocks images, fonts, media and third-party domains and loads pages eagerly; "full" loads everything
+SCRAPER_LOAD_PROFILE = LoadProfile.from_env(os.getenv("SCRAPER_LOAD_PROFILE", "lean"),
+                                            blocked_urls=os.getenv("SCRAPER_BLOCKED_URLS", ""),
+                                            allowed_urls=os.getenv("SCRAPER_ALLOWED_URLS", ""))
+SCRAPE_DEADLINE_SECONDS = float(os.getenv("SCRAPE_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", str(BROWSER_POOL_SIZE or 1)))
+SCRAPE_QUEUE_SIZE = int(os.getenv("SCRAPE_QUEUE_SIZE", "20"))
+SCRAPE_JOB_TTL = float(os.getenv("SCRAPE_JOB_TTL", "600"))
+RANGE_PARALLELISM = int(os.getenv("RANGE_PARALLELISM", "2"))
+RANGE_MAX_DAYS = int(os.getenv("RANGE_MAX_DAYS", "366"))
+CACHE_MAX_MONTHS = int(os.getenv("CACHE_MAX_MONTHS", "12"))
+CACHE_FINAL_TTL = float(os.getenv("CACHE_FINAL_TTL", str(7 * 24 * 60 * 60)))
+CACHE_TODAY_TTL = float(os.getenv("CACHE_TODAY_TTL", "60"))
+CACHE_FUTURE_TTL = float(os.getenv("CACHE_FUTURE_TTL", str(30 * 60)))
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", str(15 * 60)))
+PREFETCH_LIVE_INTERVAL = float(os.getenv("PREFETCH_LIVE_INTERVAL", "60"))
+PREFETCH_MONTH_END_DAYS = int(os.getenv("PREFETCH_MONTH_END_DAYS", "3"))
+# Opt-in: serve today's prefetched games until the next cycle instead of expiring them after CACHE_TODAY_TTL
+PREFETCH_EXTEND_TODAY_TTL = os.getenv("PREFETCH_EXTEND_TODAY_TTL", "false").lower() == "true"
+GAME_STORE_PATH = os.getenv("GAME_STORE_PATH", "./data/games.db")
+# Extra lifetime of a month lease past the scrape deadline, so a crashed worker's lease expires
+LEASE_MARGIN = float(os.getenv("LEASE_MARGIN", "5"))
+# A month scraped by another worker this recently is read back instead of scraped again
+LEASE_RECENT_SCRAPE = float(os.getenv("LEASE_RECENT_SCRAPE", "10"))
+LIVE_INTERVAL = float(os.getenv("LIVE_INTERVAL", "1"))
+LIVE_RELOAD_INTERVAL = float(os.getenv("LIVE_RELOAD_INTERVAL", "60"))
+LIVE_IDLE_TIMEOUT = float(os.getenv("LIVE_IDLE_TIMEOUT", "120"))
+LIVE_HEARTBEAT = float(os.getenv("LIVE_HEARTBEAT", "15"))
+# Cache-Control max-age of /scrape/{date}: days whose games are all FINAL change much less often
+HTTP_MAX_AGE = int(os.getenv("HTTP_MAX_AGE", "60"))
+HTTP_FINAL_MAX_AGE = int(os.getenv("HTTP_FINAL_MAX_AGE", str(60 * 60)))
+
+if PREFETCH_ENABLED and PREFETCH_EXTEND_TODAY_TTL:
+    # The scheduler rewrites today's games every cycle (every PREFETCH_LIVE_INTERVAL while games are live).
+    # If a cycle fails, scores can be stale for the whole extended TTL
+    extended_ttl = max(CACHE_TODAY_TTL, PREFETCH_INTERVAL + PREFETCH_LIVE_INTERVAL)
+    if extended_ttl != CACHE_TODAY_TTL:
+        logger.warning("PREFETCH_EXTEND_TODAY_TTL: CACHE_TODAY_TTL raised from %ss to %ss",
+                       CACHE_TODAY_TTL, extended_ttl)
+    CACHE_TODAY_TTL = extended_ttl
+
+if SCRAPER_FEED_URL:
+    schedule_feed.discover(SCRAPER_FEED_URL)
+
+schedule_cache = ScheduleCache(timezone=ZoneInfo(const.TIMEZONE), max_months=CACHE_MAX_MONTHS,
+                               final_ttl=CACHE_FINAL_TTL, today_ttl=CACHE_TODAY_TTL, future_ttl=CACHE_FUTURE_TTL)
+# Persistent store behind the in-memory cache (set GAME_STORE_PATH="" to disable)
+game_store = GameStore(GAME_STORE_PATH, timezone=ZoneInfo(const.TIMEZONE), final_ttl=CACHE_FINAL_TTL,
+                       today_ttl=CACHE_TODAY_TTL, future_ttl=CACHE_FUTURE_TTL) if GAME_STORE_PATH else None
+# Concurrent cache misses for the same month share a single browser session
+month_flight = SingleFlight()
+# Browser work runs here, off Starlette's threadpool, with a bounded queue
+# (job state is published to the store, so any worker can answer GET /scrape-jobs/{id})
+scrape_jobs = JobManager(max_workers=SCRAPE_WORKERS, max_queue=SCRAPE_QUEUE_SIZE, result_ttl=SCRAPE_JOB_TTL,
+                         deadline_seconds=SCRAPE_DEADLINE_SECONDS, store=game_store)
+
+def refresh_month(month_num: int):
+    """
+    Re-scrapes a month in the background, sharing the scrape with any concurrent request for it.
+
+    Every worker runs its own scheduler; a month another worker stored within the current
+    prefetch interval is read back from the store instead of being scraped again. Returns
+    (games_by_date, refreshed), where refreshed is False for such a read-back.
+    """
+    month_name = month_num_to_name(month_num)
+    fresh_for = PREFETCH_LIVE_INTERVAL if prefetch.live else PREFETCH_INTERVAL
+    scraped_before = game_store.month_scraped_at(month_name) if game_store is not None else None
+    games_by_date = month_flight.do(month_name, scrape_month, month_num,
+                                    Deadline(SCRAPE_DEADLINE_SECONDS), ScrapeTimings(), fresh_for)
+    refreshed = game_store is None or game_store.month_scraped_at(month_name) != scraped_before
+    return games_by_date, refreshed
+
+prefetch = PrefetchScheduler(refresh_month, timezone=ZoneInfo(const.TIMEZONE), interval=PREFETCH_INTERVAL,
+                             live_interval=PREFETCH_LIVE_INTERVAL, month_end_days=PREFETCH_MONTH_END_DAYS)
+
+def _stats_gauge(name, documentation, stats):
+    """Exports the numeric fields of a `stats()` dict as one gauge labelled by field."""
+    return REGISTRY.register(CallbackGauge(name, documentation, ("field",), lambda: {
+        (field,): value for field, value in (stats() or {}).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }))
+
+_stats_gauge("nba_browser_pool", "Browser pool state (see /stats).",
+             lambda: app.state.browser_pool.stats() if hasattr(app.state, "browser_pool") else None)
+_stats_gauge("nba_schedule_cache", "In-memory schedule cache state (see /stats).", schedule_cache.stats)
+_stats_gauge("nba_scrape_jobs", "Scrape job queue state (see /stats).", scrape_jobs.stats)
+
+# One parked browser re-reads today's games while /live has listeners
+live_scores = LiveScores(partial(NbaScraper, load_profile=SCRAPER_LOAD_PROFILE), timezone=ZoneInfo(const.TIMEZONE),
+                         interval=LIVE_INTERVAL, reload_interval=LIVE_RELOAD_INTERVAL, idle_timeout=LIVE_IDLE_TIMEOUT)
+
+class ScrapeJobRequest(BaseModel):
+    date: str
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    pool = BrowserPool(size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES, lease_timeout=BROWSER_LEASE_TIMEOUT,
+                       factory=partial(NbaScraper, load_profile=SCRAPER_LOAD_PROFILE))
+    app.state.browser_pool = pool
+    await run_in_threadpool(pool.start)
+    if PREFETCH_ENABLED:
+        prefetch.start()
+    yield
+    await run_in_threadpool(prefetch.stop)
+    await run_in_threadpool(live_scores.stop)
+    await run_in_threadpool(scrape_jobs.shutdown)
+    await run_in_threadpool(pool.close)
+    if game_store is not None:
+        game_store.close()
+
+app = FastAPI(lifespan=lifespan)
+
+def scrape_month(month_num: int, deadline: Deadline, timings: ScrapeTimings, fresh_for: float = LEASE_RECENT_SCRAPE):
+    """
+    Scrapes a whole month page and stores every day in the cache and the store.
+
+    With a store, workers coordinate through a per-month lease in the shared SQLite file:
+    only the lease holder launches Chrome, the others wait for its result and read it back.
+    The lease holder also skips the scrape when the month was stored less than `fresh_for`
+    seconds ago.
+    """
+    month_name = month_num_to_name(month_num)
+    if game_store is None:
+        return _scrape_and_store(month_num, deadline, timings)
+
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        waiting_since = time.time()
+        if game_store.acquire_lease(month_name, owner, ttl=deadline.remaining() + LEASE_MARGIN):
+            try:
+                scraped_at = game_store.month_scraped_at(month_name)
+                if scraped_at is not None and time.time() - scraped_at < fresh_for:
+                    # Another worker stored this month recently (or while we were getting here)
+                    games_by_date = game_store.get_month_games(month_name)
+                    # Keep the cache expiry counted from that scrape, not from this read-back
+                    schedule_cache.put_month(month_name, games_by_date, age=max(0.0, time.time() - scraped_at))
+                    return games_by_date
+                else:
+                    return _scrape_and_store(month_num, deadline, timings)
+            finally:
+                game_store.release_lease(month_name, owner)
+        else:
+            deadline.check("lease_wait")
+            with timings.stage("lease_wait"):
+                done = game_store.wait_for_month(month_name, waiting_since, timeout=deadline.remaining())
+            if not done:
+                deadline.check("lease_wait")
+                continue  # Lease released or expired without a result: try to take it over
+            games_by_date = game_store.get_month_games(month_name)
+            schedule_cache.put_month(month_name, games_by_date)
+            return games_by_date
+
+def _scrape_and_store(month_num: int, deadline: Deadline, timings: ScrapeTimings):
+    games_by_date = scrape_nba_month(month_num, pool=app.state.browser_pool,
+                                     extraction_mode=SCRAPER_EXTRACTION_MODE, snapshot_dir=SCRAPER_SNAPSHOT_DIR,
+                                     deadline=deadline, timings=timings)
+    # An empty month (off-season) is recorded too, so waiting workers see its scraped_at move
+    schedule_cache.put_month(month_num_to_name(month_num), games_by_date)
+    if game_store is not None:
+        game_store.upsert_month(month_num_to_name(month_num), games_by_date)
+    return games_by_date
+
+def lookup_games(month_num: int, dates: list, count: bool = True):
+    """
+    Returns (games, source) for the dates, where source is "cache" or "store",
+    or (None, None) if a scrape is needed. With `count=False` the lookup is not
+    counted in the cache and store hit/miss stats (a re-check for an already counted miss).
+    """
+    month_name = month_num_to_name(month_num)
+    cached = [schedule_cache.get(month_name, date, count=count) for date in dates]
+    if all(games is not None for games in cached):
+        return [game for games in cached for game in games], "cache"
+
+    if game_store is not None:
+        stored = game_store.get_fresh_games(month_name, dates, count=count)
+        if stored is not None:
+            # Warm the in-memory cache with the whole month, so the next requests skip SQLite
+            scraped_at = game_store.month_scraped_at(month_name)
+            if scraped_at is not None:
+                schedule_cache.put_month(month_name, game_store.get_month_games(month_name),
+                                         age=max(0.0, time.time() - scraped_at))
+            return [game for date in dates for game in stored[date]], "store"
+    return None, None
+
+def fetch_month_games(month_num: int, dates: list, deadline: Deadline, timings: ScrapeTimings, count: bool = True):
+    """
+    Returns the games for several dates of one month page, scraping that page at most once.
+
+    The cache and the store are checked first, also for jobs that queued behind a scrape of the
+    same month. With `count=False` the caller already counted the miss, so the re-check isn't counted.
+    """
+    games, _ = lookup_games(month_num, dates, count=count)
+    if games is not None:
+        return games
+
+    month_name = month_num_to_name(month_num)
+    try:
+        with timings.stage("scrape"):
+            games_by_date = month_flight.do(month_name, scrape_month, month_num, deadline, timings,
+                                            timeout=deadline.remaining())
+    except FutureTimeoutError:
+        raise ScrapeTimeoutError(f"Deadline of {deadline.seconds}s exceeded waiting for an in-flight scrape")
+    return [game for date in dates for game in games_by_date.get(date, [])]
+
+def fetch_games(date: str, deadline: Deadline, timings: ScrapeTimings, count: bool = True):
+    """Returns the games for a date, scraping (and caching) its whole month on a cache miss."""
+    return fetch_month_games(get_month_from_date_string(date), [date], deadline, timings, count=count)
+
+def run_scrape_job(job):
+    return fetch_games(job.params["date"], job.deadline, job.timings)
+
+def run_missed_scrape_job(job):
+    """Job for /scrape/{date}, which already looked the date up (and counted the miss) itself."""
+    return fetch_games(job.params["date"], job.deadline, job.timings, count=False)
+
+def run_range_job(job):
+    return fetch_month_games(job.params["month_num"], job.params["dates"], job.deadline, job.timings)
+
+def group_dates_by_month(start_date, end_date):
+    """
+    Splits an inclusive date range into the dates of each (year, month), so the same month
+    of two different years stays in separate jobs.
+    """
+    dates_by_month = {}
+    for offset in range((end_date - start_date).days + 1):
+        date = start_date + timedelta(days=offset)
+        dates_by_month.setdefault((date.year, date.month), []).append(date.strftime("%Y-%m-%d"))
+    return dates_by_month
+
+def submit_scrape_job(date: str, run=run_scrape_job):
+    """Validates the date and queues a scrape job for it (HTTP errors for bad input or a full queue)."""
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format. Use YYYY-MM-DD")
+    try:
+        return scrape_jobs.submit(run, date=date)
+    except QueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e),
+                            headers={"Retry-After": "5"})
+
+def response_max_age(games: list):
+    """
+    Client cache lifetime for a day: long only once every game is FINAL. A past day with
+    games still running (US night games after midnight in Brasília) keeps the short one.
+    """
+    if games and is_final(games):
+        return HTTP_FINAL_MAX_AGE
+    return HTTP_MAX_AGE
+
+def games_format(format: str = "json", fields: Optional[str] = None):
+    """Query parameters shared by the game endpoints: `format` (json or columnar) and `fields`."""
+    if format not in FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Invalid format. Use one of: {', '.join(FORMATS)}")
+    try:
+        return format, parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 def verify_api_key(request: Request):
     client_key = request.headers.get(API_KEY_NAME)
     if not client_key or not secrets.compare_digest(client_key, API_KEY):
@@ -24,14 +324,151 @@ def verify_api_key(request: Request):
 def root():
     return {"status": "ok"}
 
+@app.get("/stats")
+def stats(_: None = Depends(verify_api_key)):
+    return {"pool": app.state.browser_pool.stats(), "cache": schedule_cache.stats(),
+            "single_flight": month_flight.stats(), "jobs": scrape_jobs.stats(),
+            "store": game_store.stats() if game_store is not None else None, "prefetch": prefetch.stats(),
+            "live": live_scores.stats()}
+
+@app.get("/metrics")
+def metrics(_: None = Depends(verify_api_key)):
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/scrape-jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_scrape_job(request: ScrapeJobRequest, _: None = Depends(verify_api_key)):
+    job = submit_scrape_job(request.date)
+    return job.to_dict()
+
+@app.get("/scrape-jobs/{job_id}")
+def get_scrape_job(job_id: str, _: None = Depends(verify_api_key)):
+    state = scrape_jobs.get_state(job_id)
+    if state is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return state
+
+@app.get("/scrape")
+async def scrape_range(start: str, end: str, shape: tuple = Depends(games_format),
+                       _: None = Depends(verify_api_key)):
+    format, fields = shape
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date format. Use YYYY-MM-DD")
+    # Checked before expanding the range, so a huge range is rejected without building every day
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    if days > RANGE_MAX_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Range too long, at most {RANGE_MAX_DAYS} days")
+    dates_by_month = group_dates_by_month(start_date, end_date)
+
+    semaphore = asyncio.Semaphore(RANGE_PARALLELISM)
+
+    async def fetch_month(year, month_num, dates):
+        async with semaphore:
+            try:
+                job = scrape_jobs.submit(run_range_job, month_num=month_num, dates=dates)
+                return year, month_num, await asyncio.wrap_future(job.future), None
+            except Exception as e:
+                return year, month_num, [], str(e)
+
+    async def stream():
+        # Months are scraped concurrently and each one is streamed as soon as it finishes
+        tasks = [asyncio.create_task(fetch_month(year, month_num, dates))
+                 for (year, month_num), dates in dates_by_month.items()]
+        try:
+            for next_month in asyncio.as_completed(tasks):
+                year, month_num, games, error = await next_month
+                month = {"month": month_num_to_name(month_num), "year": year}
+                if error is not None:
+                    yield ndjson_line({**month, "error": error})
+                    continue
+                if format == "columnar":
+                    # One line per month, with one array per field
+                    yield ndjson_line({**month, **shape_games(games, format, fields)})
+                    continue
+                for game in shape_games(games, format, fields):
+                    yield ndjson_line(game)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/live")
+async def live(_: None = Depends(verify_api_key)):
+    """Server-sent events: a snapshot of today's games, then only score/status changes."""
+    subscriber = live_scores.subscribe()
+
+    async def stream():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=LIVE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"  # Keeps proxies (and the ngrok tunnel) from closing an idle stream
+                    continue
+                if event is None:
+                    return
+                yield sse_event(event["type"], event)
+        finally:
+            live_scores.unsubscribe(subscriber)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/scrape/{date}")
-def scrape(date: str, _: None = Depends(verify_api_key)):
+async def scrape(date: str, request: Request, response: Response, shape: tuple = Depends(games_format),
+                 _: None = Depends(verify_api_key)):
+    started = time.perf_counter()
+
+    def observe(outcome):
+        REQUEST_SECONDS.labels(endpoint="/scrape/{date}", outcome=outcome).observe(time.perf_counter() - started)
+
+    # Validate format
     try:
-        # Validate format
         datetime.strptime(date, "%Y-%m-%d")
-        games_json = scrape_nba_task(date)
-        return games_json
     except ValueError:
+        observe("invalid")
         return {"error": "Invalid date format. Use YYYY-MM-DD"}
+
+    # Cache and store hits are answered inline (a matching If-None-Match gets a 304 without scraping);
+    # misses wait on a job without holding a server thread
+    if_none_match = request.headers.get("If-None-Match")
+    # The store lookup takes GameStore's lock (held during writes), so it runs off the event loop
+    games, source = await run_in_threadpool(lookup_games, get_month_from_date_string(date), [date])
+    if games is not None:
+        reply = games_response(games, *shape, if_none_match=if_none_match, max_age=response_max_age(games))
+        observe("not_modified" if reply.status_code == status.HTTP_304_NOT_MODIFIED else source)
+        return reply
+
+    try:
+        job = submit_scrape_job(date, run=run_missed_scrape_job)
+    except HTTPException as e:
+        observe("rejected")
+        response.status_code = e.status_code
+        response.headers.update(e.headers or {})
+        return {"error": e.detail}
+
+    outcome = "error"
+    try:
+        games = await asyncio.wrap_future(job.future)
+        outcome = "scrape"
+        # Headers set on `response` are not applied to a Response returned directly
+        return games_response(games, *shape, headers={"Server-Timing": job.timings.server_timing()},
+                              if_none_match=if_none_match, max_age=response_max_age(games))
+    except (ScrapeTimeoutError, PoolTimeoutError) as e:
+        outcome = "timeout"
+        response.status_code = status.HTTP_504_GATEWAY_TIMEOUT
+        return {"error": str(e)}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        logger.exception("Scrape for %s failed", date)
+        return {"error": str(e)}
+    finally:
+        observe(outcome)
+        if job.timings.stages:
+            logger.info("Timings for %s: %s", date, job.timings.as_dict())
+            response.headers["Server-Timing"] = job.timings.server_timing()
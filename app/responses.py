@@ -0,0 +1,74 @@
+"""
+Response encoding for game lists: plain JSON or a compact columnar layout,
+serialized with pydantic-core's JSON encoder instead of FastAPI's generic one.
+"""
+from fastapi import Response
+from pydantic_core import to_json
+from scrapers.models.game import Game
+import hashlib
+
+GAME_FIELDS = tuple(Game.model_fields)
+FORMATS = ("json", "columnar")
+
+
+def parse_fields(fields):
+    """Parses the comma-separated `fields` query parameter (None means every field)."""
+    if not fields:
+        return GAME_FIELDS
+    selected = tuple(field.strip() for field in fields.split(",") if field.strip())
+    unknown = [field for field in selected if field not in GAME_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(GAME_FIELDS)}")
+    return selected
+
+
+def shape_games(games, format="json", fields=GAME_FIELDS):
+    """
+    Returns the games in the requested layout:
+    - "json": a list of game objects (only `fields`);
+    - "columnar": {"count": n, "columns": {field: [values...]}}, one array per field.
+    """
+    if format == "columnar":
+        return {"count": len(games), "columns": {field: [game.get(field) for game in games] for field in fields}}
+    if fields == GAME_FIELDS:
+        return games
+    return [{field: game.get(field) for field in fields} for game in games]
+
+
+def body_etag(body):
+    """Strong ETag for an encoded body: a short SHA-1 of its bytes, like `generate_game_id`."""
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """Checks an `If-None-Match` header (a list of tags, possibly weak, or `*`) against `etag`."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def games_response(games, format="json", fields=GAME_FIELDS, headers=None, if_none_match=None, max_age=None):
+    """
+    Encodes the games with an `ETag` (and `Cache-Control` when `max_age` is given).
+    Answers 304 with no body when `if_none_match` already names the same content.
+    """
+    body = to_json(shape_games(games, format, fields))
+    headers = dict(headers or {})
+    headers["ETag"] = body_etag(body)
+    if max_age is not None:
+        headers["Cache-Control"] = f"private, max-age={int(max_age)}"
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def ndjson_line(value):
+    return to_json(value) + b"\n"
+
+
+def sse_event(name, value):
+    return b"event: " + name.encode() + b"\ndata: " + to_json(value) + b"\n\n"
@@ -1,2 +1,5 @@
 BASE_URL = "https://www.nba.com/schedule?cal=MONTH&region=11&pd=false"
-TIMEZONE = "Brazil/East"
\ No newline at end of file
+TIMEZONE = "Brazil/East"
+# Feed JSON da programação da temporada (o mesmo consumido pela página de programação)
+SCHEDULE_FEED_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
\ No newline at end of file
@@ -0,0 +1,168 @@
+import scrapers.nba_scraper.constants as const
+from datetime import datetime
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+
+
+class ScheduleFeed:
+    """
+    Cliente do feed JSON da programação da temporada, o mesmo que a página de
+    programação da nba.com consome antes de renderizar os blocos ScheduleDay.
+
+    A URL começa em `const.SCHEDULE_FEED_URL` e é trocada por `discover` quando o
+    navegador captura o feed com outro endereço. O último feed baixado fica em
+    memória e é revalidado com ETag/Last-Modified, já que todos os meses da
+    temporada vêm no mesmo arquivo.
+    """
+
+    def __init__(self, url=const.SCHEDULE_FEED_URL):
+        self.url = url
+        self._lock = threading.Lock()
+        self._data = None
+        self._validators = {}
+        self.fetches = 0
+        self.not_modified = 0
+
+    def discover(self, url):
+        """Passa a buscar o feed direto em `url` (descoberta pela captura no navegador)."""
+        with self._lock:
+            if url != self.url:
+                self.url, self._data, self._validators = url, None, {}
+
+    def remember(self, url, data):
+        """Guarda um feed capturado pelo navegador como a versão mais recente."""
+        self.discover(url)
+        with self._lock:
+            self._data = data
+
+    def fetch(self, timeout=10):
+        """
+        Baixa o feed, ou confirma com uma requisição condicional que ele não mudou.
+
+        Args:
+            timeout (float): Tempo máximo da requisição, em segundos.
+
+        Returns:
+            dict: Feed decodificado.
+        """
+        with self._lock:
+            url, validators, cached = self.url, dict(self._validators), self._data
+
+        headers = {"User-Agent": const.USER_AGENT, "Accept": "application/json", "Accept-Encoding": "gzip"}
+        if cached is not None:
+            headers.update(validators)
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                data = json.loads(body)
+                new_validators = {}
+                if response.headers.get("ETag"):
+                    new_validators["If-None-Match"] = response.headers["ETag"]
+                if response.headers.get("Last-Modified"):
+                    new_validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                with self._lock:
+                    self.not_modified += 1
+                return cached
+            raise
+
+        with self._lock:
+            if self.url == url:
+                self._data, self._validators = data, new_validators
+            self.fetches += 1
+        return data
+
+
+def _status_text(game):
+    # A página mostra o status em maiúsculas ("FINAL", "7:30 PM ET"), que é o formato
+    # esperado por `format_game_time`; o feed traz "Final" e "7:30 pm ET".
+    status_text = (game.get("gameStatusText") or "").strip()
+    if game.get("gameStatus") == 3 and not status_text:
+        status_text = "Final"
+    return status_text.upper() or None
+
+
+def _broadcaster(game):
+    national = (game.get("broadcasters") or {}).get("nationalBroadcasters") or []
+    if national and national[0].get("broadcasterDisplay"):
+        return national[0]["broadcasterDisplay"]
+    return "NBA League Pass"
+
+
+def _score(team, game):
+    # Jogos que ainda não começaram vêm com placar 0 no feed e sem placar na página
+    if game.get("gameStatus") == 1 or team.get("score") is None:
+        return None
+    return str(team["score"])
+
+
+def feed_to_schedule_days(feed, month_num=None):
+    """
+    Converte o feed JSON da temporada nos dias brutos consumidos por `parsing.build_games`.
+
+    Os dias já trazem `full_date` (o feed tem o ano), então o ano não precisa ser
+    deduzido pelo dia da semana como na página.
+
+    Parâmetros:
+        feed (dict): Feed no formato `{"leagueSchedule": {"gameDates": [...]}}`.
+        month_num (int, opcional): Se informado, apenas os dias desse mês são convertidos.
+
+    Retorno:
+        list: Dias no formato `{"full_date": "YYYY-MM-DD", "games": list}`.
+    """
+    schedule_days = []
+    for game_date in feed["leagueSchedule"]["gameDates"]:
+        day = datetime.strptime(game_date["gameDate"].split(" ")[0], "%m/%d/%Y")
+        if month_num is not None and day.month != month_num:
+            continue
+
+        games = []
+        for game in game_date.get("games") or []:
+            away, home = game.get("awayTeam") or {}, game.get("homeTeam") or {}
+            arena = game.get("arenaName")
+            city, state = game.get("arenaCity"), game.get("arenaState")
+            games.append({
+                "status_text": _status_text(game),
+                "broadcaster": _broadcaster(game),
+                "teams": [away.get("teamName"), home.get("teamName")],
+                "scores": [] if _score(home, game) is None else [_score(away, game), _score(home, game)],
+                "location": [arena, f"{city}, {state or ''}"] if arena and city else None,
+            })
+        schedule_days.append({"full_date": day.strftime("%Y-%m-%d"), "games": games})
+    return schedule_days
+
+
+def load_feed_file(path):
+    """
+    Lê um feed salvo em disco.
+
+    Parâmetros:
+        path (str): Caminho do arquivo JSON.
+
+    Retorno:
+        dict: Feed decodificado.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Feed compartilhado por todas as raspagens do processo
+schedule_feed = ScheduleFeed()
+
+
+if __name__ == "__main__":
+    # Uso: python -m scrapers.nba_scraper.feed feed.json [YYYY-MM-DD]
+    from scrapers.nba_scraper.parsing import build_games
+    import sys
+
+    date_str = sys.argv[2] if len(sys.argv) > 2 else None
+    month_num = int(date_str[5:7]) if date_str else None
+    games_by_date = build_games(feed_to_schedule_days(load_feed_file(sys.argv[1]), month_num), date_str=date_str)
+    print(json.dumps(games_by_date, ensure_ascii=False, indent=2))
@@ -0,0 +1,101 @@
+from lxml import etree, html as lxml_html
+
+# XPaths compilados uma única vez; são os mesmos usados pelos métodos de `NbaScraper`,
+# mas avaliados em processo sobre um snapshot do HTML em vez de remotamente pelo chromedriver.
+_SCHEDULE_DAYS = etree.XPath(".//div[contains(@class, 'ScheduleDay_sd_')]")
+_DAY_DATE = etree.XPath(".//h4[contains(@class, 'ScheduleDay_sdDay')]")
+_DAY_GAMES = etree.XPath(".//div[contains(@class, 'ScheduleDay_sdGames')]")
+_GAMES = etree.XPath("./div[contains(@class, 'ScheduleGame')]")
+_STATUS_TEXT = etree.XPath(".//span[contains(@class, 'ScheduleStatusText')]")
+_BROADCASTERS = etree.XPath(".//div[contains(@class, 'Broadcasters')]")
+_BROADCASTER = etree.XPath(".//p[contains(@class, 'Broadcaster')]")
+_TEAMS = etree.XPath(".//div[contains(@class, 'ScheduleGame_sgTeam')]")
+_SCORES = etree.XPath(".//div[contains(@class, 'ScheduleGame_sgScore')]")
+_LOCATION_INNER = etree.XPath(".//div[contains(@class, 'ScheduleGame_sgLocationInner')]")
+_FIRST_LINK = etree.XPath(".//a")
+_FIRST_SPAN = etree.XPath(".//span")
+_DIVS = etree.XPath(".//div")
+
+
+def _first(xpath, element):
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _text(element):
+    """Aproxima o `.text` do Selenium: texto do elemento com espaços normalizados."""
+    if element is None:
+        return None
+    return " ".join(element.text_content().split())
+
+
+def _parse_game(schedule_game):
+    broadcaster = None
+    broadcasters_div = _first(_BROADCASTERS, schedule_game)
+    if broadcasters_div is not None:
+        broadcaster_p = _first(_BROADCASTER, broadcasters_div)
+        broadcaster = _text(broadcaster_p) if broadcaster_p is not None else "NBA League Pass"
+
+    location_inner = _first(_LOCATION_INNER, schedule_game)
+    location = [div.text_content() for div in _DIVS(location_inner)] if location_inner is not None else None
+
+    return {
+        "status_text": _text(_first(_STATUS_TEXT, schedule_game)),
+        "broadcaster": broadcaster,
+        "teams": [_text(_first(_FIRST_LINK, team)) for team in _TEAMS(schedule_game)],
+        "scores": [_text(_first(_FIRST_SPAN, score)) for score in _SCORES(schedule_game)],
+        "location": location,
+    }
+
+
+def parse_schedule_html(page_source):
+    """
+    Extrai a programação de um snapshot HTML da página da NBA, sem navegador.
+
+    Parâmetros:
+        page_source (str | bytes): HTML da página (por ex: `NbaScraper.page_source`).
+
+    Retorno:
+        list: Dias no formato `{"date": str, "games": list}`, o mesmo formato de
+        `NbaScraper.get_schedule_data`, consumido por `parsing.build_games`.
+    """
+    document = lxml_html.fromstring(page_source)
+    schedule_days = []
+    for schedule_day in _SCHEDULE_DAYS(document):
+        date_h4 = _first(_DAY_DATE, schedule_day)
+        games_div = _first(_DAY_GAMES, schedule_day)
+        schedule_days.append({
+            "date": date_h4.text_content() if date_h4 is not None else None,
+            "games": [_parse_game(game) for game in _GAMES(games_div)] if games_div is not None else [],
+        })
+    return schedule_days
+
+
+def parse_schedule_file(path):
+    """
+    Extrai a programação de um arquivo HTML salvo.
+
+    Parâmetros:
+        path (str): Caminho do arquivo HTML.
+
+    Retorno:
+        list: Dias no formato de `parse_schedule_html`.
+    """
+    with open(path, "rb") as f:
+        return parse_schedule_html(f.read())
+
+
+if __name__ == "__main__":
+    # Uso: python -m scrapers.nba_scraper.html_parser snapshot.html [YYYY-MM-DD]
+    from scrapers.nba_scraper.parsing import build_games
+    from zoneinfo import ZoneInfo
+    import scrapers.nba_scraper.constants as const
+    import json
+    import sys
+
+    games_by_date = build_games(
+        parse_schedule_file(sys.argv[1]),
+        timezone=ZoneInfo(const.TIMEZONE),
+        date_str=sys.argv[2] if len(sys.argv) > 2 else None,
+    )
+    print(json.dumps(games_by_date, ensure_ascii=False, indent=2))
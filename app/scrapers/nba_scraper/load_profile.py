@@ -0,0 +1,119 @@
+import json
+
+# Recursos que não fazem parte do DOM da programação: imagens, fontes e mídia.
+# `Network.setBlockedURLs` bloqueia por padrão de URL (com `*`), não por tipo de recurso.
+RESOURCE_URL_PATTERNS = (
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.ts?*", "*.mp3*",
+)
+
+# Domínios de terceiros (anúncios, analytics, consentimento e redes sociais). Os scripts
+# da própria nba.com continuam liberados: são eles que renderizam os blocos ScheduleDay.
+THIRD_PARTY_URL_PATTERNS = (
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*googletagservices.com*", "*amazon-adsystem.com*", "*adsrvr.org*", "*adnxs.com*", "*criteo.*",
+    "*taboola.com*", "*outbrain.com*", "*scorecardresearch.com*", "*quantserve.com*", "*chartbeat.*",
+    "*omtrdc.net*", "*demdex.net*", "*adobedtm.com*", "*everesttech.net*", "*cookielaw.org*",
+    "*onetrust.com*", "*facebook.net*", "*facebook.com*", "*twitter.com*", "*bing.com*",
+    "*tiktok.com*", "*snapchat.com*", "*newrelic.com*", "*nr-data.net*", "*branch.io*",
+    "*conviva.com*", "*brightcove.*", "*optimizely.com*",
+)
+
+DEFAULT_BLOCKED_URLS = RESOURCE_URL_PATTERNS + THIRD_PARTY_URL_PATTERNS
+
+
+class LoadProfile:
+    """
+    Perfil de carregamento enxuto da página de programação.
+
+    O Chrome é iniciado com a estratégia de carregamento `eager` (o `get` volta no
+    DOMContentLoaded) e com imagens desligadas; as URLs de `blocked_urls` são
+    bloqueadas pelo DevTools (`Network.setBlockedURLs`). Com `report`, o log de
+    performance do Chrome é usado para contar bytes transferidos e requisições
+    bloqueadas a cada carregamento.
+    """
+
+    def __init__(self, page_load_strategy="eager", block_images=True, blocked_urls=DEFAULT_BLOCKED_URLS,
+                 allowed_urls=(), report=True):
+        """
+        Args:
+            page_load_strategy (str): "eager", "normal" ou "none".
+            block_images (bool): Desliga o carregamento de imagens no próprio Chrome.
+            blocked_urls (iterable): Padrões de URL bloqueados (lista de bloqueio).
+            allowed_urls (iterable): Padrões retirados da lista de bloqueio (por ex:
+                "*.svg*" para voltar a carregar os logos). Precisam ser iguais ao
+                padrão bloqueado, já que o Chrome só aceita uma lista de bloqueio.
+            report (bool): Coleta bytes transferidos e requisições bloqueadas.
+        """
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.allowed_urls = tuple(allowed_urls)
+        self.blocked_urls = tuple(url for url in dict.fromkeys(blocked_urls) if url not in self.allowed_urls)
+        self.report = report
+
+    @classmethod
+    def from_env(cls, name, blocked_urls="", allowed_urls=""):
+        """
+        Monta o perfil a partir da configuração do serviço.
+
+        Args:
+            name (str): "lean" para o perfil enxuto ou "full" para carregar a página inteira.
+            blocked_urls (str): Padrões extras de bloqueio, separados por vírgula.
+            allowed_urls (str): Padrões liberados, separados por vírgula.
+
+        Returns:
+            LoadProfile | None: None para o perfil "full".
+        """
+        if name == "full":
+            return None
+        if name != "lean":
+            raise ValueError(f"Perfil de carregamento inválido: {name}")
+        return cls(blocked_urls=DEFAULT_BLOCKED_URLS + _split(blocked_urls), allowed_urls=_split(allowed_urls))
+
+    def apply_options(self, chrome_options):
+        """Configura as opções do Chrome antes de iniciar o navegador."""
+        chrome_options.page_load_strategy = self.page_load_strategy
+        if self.block_images:
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.report:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def apply_session(self, driver):
+        """Ativa o bloqueio de URLs no DevTools do navegador já iniciado."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(self.blocked_urls)})
+
+
+def _split(value):
+    return tuple(item.strip() for item in (value or "").split(",") if item.strip())
+
+
+def summarize_performance_log(entries):
+    """
+    Resume as entradas do log de performance do Chrome de um carregamento.
+
+    Args:
+        entries (list): Retorno de `driver.get_log("performance")`.
+
+    Returns:
+        dict: Requisições feitas, bytes transferidos (comprimidos, como vieram da
+        rede), requisições bloqueadas e requisições que falharam por outros motivos.
+    """
+    stats = {"requests": 0, "bytes": 0, "blocked": 0, "failed": 0}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            stats["bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                stats["blocked"] += 1
+            elif not params.get("canceled"):
+                stats["failed"] += 1
+    return stats
@@ -1,30 +1,58 @@
 import scrapers.nba_scraper.constants as const  # Importa as constantes definidas no módulo nba_scraper
 from scrapers.nba_scraper.utils import format_game_time # Importa funções utilitárias para formatação de data e hora
+from scrapers.nba_scraper.scripts import EXTRACT_SCHEDULE_JS, SCHEDULE_INDEX_JS, SCHEDULE_READINESS_JS
+from scrapers.nba_scraper.load_profile import summarize_performance_log
 from selenium import webdriver  # Importa o WebDriver do Selenium para controle do navegador
 from selenium.webdriver.common.by import By  # Importa o localizador de elementos
 from selenium.common.exceptions import NoSuchElementException  # Para tratamento de exceções
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException, TimeoutException
+from metrics import CHROME_LAUNCHES, EXTRACTION_ERRORS
+import base64
+import json
+import logging
 import tempfile
 import os
 import shutil
+import socket
+import time
 from datetime import timedelta, datetime
 
+logger = logging.getLogger(__name__)
+
+
+def _find_free_port():
+    """Pede ao sistema operacional uma porta TCP livre para o DevTools do Chrome."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
 class NbaScraper(webdriver.Chrome):
     """
     Classe para raspar informações sobre jogos da NBA usando Selenium.
     Herda da classe webdriver.Chrome para controlar o navegador Chrome.
     """
 
-    def __init__(self):
+    def __init__(self, debugging_port=None, implicit_wait=0, load_profile=None):
         """
         Inicializa a classe, configurando o caminho do driver do Chrome e iniciando o navegador.
 
         Args:
-            driver_path (str): Caminho para o diretório onde está o driver do Chrome.
+            debugging_port (int, opcional): Porta do DevTools. Se omitida, uma porta livre é
+                escolhida para que vários navegadores possam rodar lado a lado.
+            implicit_wait (float): Espera implícita do WebDriver. Por padrão é 0: a prontidão
+                da página é verificada por `wait_for_schedule`, e campos opcionais ausentes
+                (como a emissora) não devem custar segundos de espera.
+            load_profile (LoadProfile, opcional): Perfil de carregamento enxuto (bloqueio de
+                recursos e terceiros, carregamento `eager`). Sem perfil, a página é carregada inteira.
         """
         # Create a unique temporary directory for user data
         self.temp_dir = tempfile.mkdtemp()
+        self.debugging_port = debugging_port or _find_free_port()
+        self.lease_count = 0  # Quantas vezes o navegador foi emprestado pelo BrowserPool
+        self.load_profile = load_profile
+        self._performance_log = []  # Eventos de rede desde o último `land_first_page`
 
         # Configura as opções do Chrome para ambiente Docker
         chrome_options = Options()
@@ -36,17 +64,26 @@ class NbaScraper(webdriver.Chrome):
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--disable-infobars')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'--user-agent={const.USER_AGENT}')
         chrome_options.add_argument(f'--user-data-dir={self.temp_dir}')
-        chrome_options.add_argument('--remote-debugging-port=9222')  # Add debugging port
+        chrome_options.add_argument(f'--remote-debugging-port={self.debugging_port}')  # Porta única por instância
+        if load_profile is not None:
+            load_profile.apply_options(chrome_options)
         
         # Create service object for ChromeDriver
         service = Service('/usr/bin/chromedriver')
         
         # Inicializa o WebDriver with service object
         super(NbaScraper, self).__init__(options=chrome_options, service=service)
+        CHROME_LAUNCHES.inc()
         
-        self.implicitly_wait(10)  # Increase implicit wait time for Docker environment
+        self.implicitly_wait(implicit_wait)
+        if load_profile is not None:
+            try:
+                load_profile.apply_session(self)
+            except Exception:
+                self.__exit__(None, None, None)
+                raise
 
     def __del__(self):
         """
@@ -68,23 +105,154 @@ class NbaScraper(webdriver.Chrome):
         """
         Garante que o navegador seja fechado corretamente ao sair do contexto.
         """
-        print("Closing the NbaScraper...")
+        logger.debug("Closing the NbaScraper...")
         try:
             self.quit()
         except Exception as e:
-            print(f"Error closing browser: {e}")
+            logger.warning("Error closing browser: %s", e)
         
         # Clean up the temporary directory
         try:
             if os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
         except Exception as e:
-            print(f"Error removing temporary directory: {e}")
+            logger.warning("Error removing temporary directory: %s", e)
+
+    def is_alive(self):
+        """
+        Verifica se o navegador ainda responde a comandos.
+
+        Returns:
+            bool: True se o Chrome e o chromedriver estiverem respondendo.
+        """
+        try:
+            self.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def reset(self):
+        """
+        Limpa o estado do navegador entre dois empréstimos do pool
+        (cookies, storage e página atual).
+        """
+        self.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        self.delete_all_cookies()
+        self.get("about:blank")
 
     def land_first_page(self, url=const.BASE_URL):
         """Acessa a página inicial da NBA definida em `const.BASE_URL`."""
+        if self.reports_page_load():
+            self.get_log("performance")  # Descarta eventos anteriores (por ex: do reset)
+            self._performance_log = []
         self.get(url)
 
+    def reports_page_load(self):
+        """Indica se `page_load_stats` está disponível (perfil com `report`)."""
+        return self.load_profile is not None and self.load_profile.report
+
+    def page_load_stats(self):
+        """
+        Resume a rede usada desde o último `land_first_page`.
+
+        Returns:
+            dict: Requisições, bytes transferidos, requisições bloqueadas e falhas.
+        """
+        return summarize_performance_log(self._read_performance_log())
+
+    def capture_json_response(self, url_fragment, timeout=10, poll_interval=0.1):
+        """
+        Espera a página baixar uma resposta cuja URL contém `url_fragment` e devolve
+        o corpo já decodificado, lido do próprio Chrome (sem baixar de novo).
+
+        Args:
+            url_fragment (str): Trecho da URL procurada (por ex: "scheduleLeagueV2").
+            timeout (float): Tempo máximo de espera, em segundos.
+            poll_interval (float): Intervalo entre leituras do log de performance.
+
+        Returns:
+            tuple: (URL da resposta, JSON decodificado).
+
+        Raises:
+            TimeoutException: Se a resposta não chegar dentro de `timeout`.
+        """
+        if not self.reports_page_load():
+            raise RuntimeError("A captura de rede exige um perfil de carregamento com `report`")
+
+        started = time.monotonic()
+        while True:
+            responses, finished = {}, set()
+            for entry in self._read_performance_log():
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                params = message.get("params", {})
+                if message.get("method") == "Network.responseReceived":
+                    if url_fragment in params.get("response", {}).get("url", ""):
+                        responses[params["requestId"]] = params["response"]["url"]
+                elif message.get("method") == "Network.loadingFinished":
+                    finished.add(params.get("requestId"))
+
+            for request_id, url in responses.items():
+                if request_id in finished:
+                    body = self.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                    text = body["body"]
+                    if body.get("base64Encoded"):
+                        text = base64.b64decode(text)
+                    return url, json.loads(text)
+
+            if time.monotonic() - started >= timeout:
+                raise TimeoutException(f"Nenhuma resposta com '{url_fragment}' em {timeout}s")
+            time.sleep(poll_interval)
+
+    def _read_performance_log(self):
+        self._performance_log.extend(self.get_log("performance"))
+        return self._performance_log
+
+    def wait_for_schedule(self, timeout=10, poll_interval=0.25, stable_polls=2, empty_grace=5):
+        """
+        Espera até os blocos `ScheduleDay_sd_` estarem renderizados e estáveis.
+
+        A página é considerada pronta quando o número de dias e de jogos não muda por
+        `stable_polls` verificações seguidas. Se o documento terminou de carregar e
+        nenhum dia apareceu em `empty_grace` segundos, o mês é tratado como sem jogos.
+
+        Args:
+            timeout (float): Tempo máximo de espera, em segundos.
+            poll_interval (float): Intervalo entre verificações, em segundos.
+            stable_polls (int): Verificações iguais seguidas exigidas.
+            empty_grace (float): Espera extra por dias após o carregamento do documento.
+
+        Returns:
+            int: Número de dias encontrados.
+
+        Raises:
+            TimeoutException: Se a página não ficar pronta dentro de `timeout`.
+        """
+        started = time.monotonic()
+        loaded_at = None
+        last_counts = None
+        stable = 0
+        while True:
+            state = self.execute_script(SCHEDULE_READINESS_JS)
+            now = time.monotonic()
+            counts = (state["days"], state["games"])
+
+            if state["days"] > 0:
+                stable = stable + 1 if counts == last_counts else 1
+                if stable >= stable_polls:
+                    return state["days"]
+            elif state["ready_state"] == "complete":
+                loaded_at = loaded_at or now
+                if now - loaded_at >= empty_grace:
+                    return 0
+            last_counts = counts
+
+            if now - started >= timeout:
+                raise TimeoutException(f"A programação não ficou pronta em {timeout}s")
+            time.sleep(poll_interval)
+
     def get_schedule_days(self):
         """
         Retorna todos os blocos de dias com jogos na programação.
@@ -94,6 +262,56 @@ class NbaScraper(webdriver.Chrome):
         """
         return self.find_elements(By.XPATH, ".//div[contains(@class, 'ScheduleDay_sd_')]")
 
+    def get_schedule_data(self):
+        """
+        Extrai a programação inteira do mês com um único script injetado na página,
+        em vez de uma chamada ao WebDriver por campo.
+
+        Returns:
+            list: Dias no formato `{"date": str, "games": list}`, consumidos por
+            `parsing.build_games`.
+        """
+        return self._run_schedule_script()
+
+    def get_schedule_day_data(self, heading):
+        """
+        Extrai apenas os dias pedidos, parando assim que todos forem encontrados.
+
+        Args:
+            heading (str | list): Título do dia na página (por ex: "Friday, March 15")
+                ou lista de títulos.
+
+        Returns:
+            list: Os dias encontrados, no formato de `get_schedule_data`.
+        """
+        return self._run_schedule_script(heading)
+
+    def _run_schedule_script(self, *args):
+        schedule_data = self.execute_script(EXTRACT_SCHEDULE_JS, *args)
+        if not isinstance(schedule_data, list):
+            raise ValueError("O script de extração não retornou uma lista de dias")
+        return schedule_data
+
+    def get_schedule_index(self, resolver):
+        """
+        Indexa os dias da página por data em uma única ida e volta ao WebDriver.
+
+        Args:
+            resolver (DateResolver): Converte os títulos em "YYYY-MM-DD" (o ano é
+                deduzido uma vez por mês).
+
+        Returns:
+            dict: Mapeia "YYYY-MM-DD" para o elemento do dia, na ordem da página.
+        """
+        index = {}
+        for schedule_day, heading in self.execute_script(SCHEDULE_INDEX_JS):
+            try:
+                index[resolver.resolve(heading)] = schedule_day
+            except (AttributeError, ValueError) as e:
+                EXTRACTION_ERRORS.labels(field="date").inc()
+                logger.warning("Erro ao processar dia: %s", e)
+        return index
+
     def get_schedule_day_date(self, schedule_day):
         """
         Obtém a data de um dia específico da programação.
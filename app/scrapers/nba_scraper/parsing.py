@@ -0,0 +1,138 @@
+from scrapers.nba_scraper.utils import DateResolver, format_game_time, generate_game_id
+from metrics import EXTRACTION_ERRORS
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def make_game_data(full_date, game_time, broadcaster, away_team, home_team,
+                   away_team_score, home_team_score, arena, city, state):
+    """
+    Monta o dicionário de um jogo no formato retornado pela API.
+
+    Parâmetros:
+        full_date (str): Data do jogo no formato "YYYY-MM-DD".
+        game_time (str): Horário do jogo (já convertido) ou status do evento.
+        broadcaster (str | None): Emissora do jogo.
+        away_team (str), home_team (str): Nomes dos times visitante e mandante.
+        away_team_score, home_team_score: Placares (None se o jogo não aconteceu).
+        arena (str), city (str), state (str): Local do jogo.
+
+    Retorno:
+        dict: Dados do jogo, incluindo o `game_id`.
+    """
+    return {
+        "game_id": generate_game_id(full_date, home_team, away_team),
+        "full_date": full_date,
+        "game_time": game_time,
+        "broadcaster": broadcaster,
+        "home_team": home_team,
+        "away_team": away_team,
+        "home_team_score": home_team_score,
+        "away_team_score": away_team_score,
+        "arena": arena,
+        "city": city,
+        "state": state
+    }
+
+
+class ExtractionError(ValueError):
+    """Um campo obrigatório não pôde ser extraído da página."""
+
+    def __init__(self, field, reason):
+        super().__init__(f"Erro ao extrair o campo '{field}': {reason}")
+        self.field = field
+
+
+@contextmanager
+def extracting(field):
+    """Converte qualquer erro dentro do bloco em `ExtractionError` do campo informado."""
+    try:
+        yield
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(field, e) from e
+
+
+def _required(value, field):
+    if value is None or (isinstance(value, list) and None in value):
+        raise ExtractionError(field, "campo ausente")
+    return value
+
+
+def build_game(full_date, raw_game):
+    """
+    Converte um jogo extraído da página (ver `scripts.EXTRACT_SCHEDULE_JS`) no
+    dicionário da API, aplicando as mesmas regras dos métodos de `NbaScraper`.
+
+    Parâmetros:
+        full_date (str): Data do jogo no formato "YYYY-MM-DD".
+        raw_game (dict): Campos brutos do jogo.
+
+    Retorno:
+        dict: Dados do jogo.
+
+    Raises:
+        ExtractionError: Se algum campo obrigatório estiver ausente ou malformado.
+    """
+    status_text = _required(raw_game.get("status_text"), "status_text")
+    try:
+        game_time = format_game_time(status_text)
+    except Exception:
+        game_time = status_text
+
+    with extracting("teams"):
+        away_team, home_team = _required(raw_game.get("teams"), "teams")
+    with extracting("scores"):
+        # Se o jogo ainda não aconteceu, a lista de placares vem vazia.
+        away_team_score, home_team_score = _required(raw_game.get("scores"), "scores") or [None, None]
+    with extracting("location"):
+        location = _required(raw_game.get("location"), "location")
+        arena = location[0]
+        city, state = map(str.strip, location[1].split(","))
+
+    return make_game_data(full_date, game_time, raw_game.get("broadcaster"), away_team, home_team,
+                          away_team_score, home_team_score, arena, city, state)
+
+
+def build_games(schedule_days, timezone=None, date_str=None):
+    """
+    Converte a programação bruta do mês em listas de jogos por data.
+
+    Parâmetros:
+        schedule_days (list): Dias no formato `{"date": str, "games": list}`. Dias que já
+            trazem `full_date` ("YYYY-MM-DD", por ex: do feed JSON) não passam pelo `DateResolver`.
+        timezone (datetime.tzinfo, opcional): Fuso usado para deduzir o ano (ver `DateResolver`).
+        date_str (str, opcional): Se informado, apenas essa data é processada.
+
+    Retorno:
+        dict: Mapeia "YYYY-MM-DD" para a lista de jogos (dicionários) daquele dia.
+        Jogos com campos inválidos são descartados.
+    """
+    resolver = DateResolver(timezone)
+    games_by_date = {}
+    for schedule_day in schedule_days:
+        try:
+            with extracting("date"):
+                full_date = schedule_day.get("full_date") or resolver.resolve(
+                    _required(schedule_day.get("date"), "date"))
+        except ExtractionError as e:
+            EXTRACTION_ERRORS.labels(field=e.field).inc()
+            logger.warning("Erro ao processar dia: %s", e)
+            continue
+
+        if date_str is not None and full_date != date_str:
+            continue
+
+        games = games_by_date.setdefault(full_date, [])
+        for raw_game in schedule_day.get("games") or []:
+            try:
+                games.append(build_game(full_date, raw_game))
+            except ExtractionError as e:
+                EXTRACTION_ERRORS.labels(field=e.field).inc()
+                logger.warning("Erro ao processar jogo individual em %s: %s", full_date, e)
+        if date_str is not None:
+            break  # Cada data aparece uma única vez na página
+    return games_by_date
@@ -0,0 +1,212 @@
+from scrapers.nba_scraper.nba_scraper import NbaScraper
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Nenhum navegador ficou disponível dentro do tempo de espera."""
+
+
+class BrowserPool:
+    """
+    Pool limitado de instâncias pré-inicializadas de `NbaScraper`.
+
+    Cada requisição pega um navegador emprestado com `lease()`. Ao devolver, o estado
+    do navegador é limpo com `NbaScraper.reset()`. Navegadores são reciclados depois
+    de `max_uses` empréstimos, quando quebram durante o uso ou quando falham no
+    health check.
+    """
+
+    def __init__(self, size=2, max_uses=50, lease_timeout=60, factory=NbaScraper):
+        """
+        Args:
+            size (int): Número máximo de navegadores vivos ao mesmo tempo.
+            max_uses (int): Empréstimos antes de um navegador ser reciclado.
+            lease_timeout (float): Tempo máximo, em segundos, esperando um navegador livre.
+            factory (callable): Função que cria um novo `NbaScraper`.
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self.factory = factory
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._total = 0  # Navegadores vivos (ociosos + emprestados + sendo iniciados)
+        self._closed = False
+
+        self._leases = 0
+        self._launches = 0
+        self._launch_failures = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._recycles = {"max_uses": 0, "crashed": 0, "unhealthy": 0, "reset_failed": 0}
+
+    def start(self):
+        """Inicia os navegadores do pool antecipadamente (warm start)."""
+        for _ in range(self.size):
+            with self._cond:
+                if self._closed or self._total >= self.size:
+                    return
+                self._total += 1
+            try:
+                scraper = self._launch()
+            except Exception as e:
+                logger.warning("Erro ao iniciar navegador do pool: %s", e)
+                with self._cond:
+                    self._total -= 1
+                continue
+            with self._cond:
+                self._idle.append(scraper)
+                self._cond.notify()
+
+    def close(self):
+        """Fecha todos os navegadores ociosos e impede novos empréstimos."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for scraper in idle:
+            self._quit(scraper)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Empresta um navegador do pool durante o bloco `with`.
+
+        Args:
+            timeout (float, opcional): Sobrescreve `lease_timeout` para este empréstimo.
+
+        Yields:
+            NbaScraper: Navegador pronto para uso.
+        """
+        scraper = self._acquire(self.lease_timeout if timeout is None else timeout)
+        crashed = False
+        try:
+            yield scraper
+        except WebDriverException:
+            crashed = True
+            raise
+        finally:
+            self._release(scraper, crashed=crashed)
+
+    def stats(self):
+        """
+        Retorna as métricas do pool.
+
+        Returns:
+            dict: Tamanho, ocupação, tempo de espera e contagem de reciclagens.
+        """
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "alive": self._total,
+                "idle": idle,
+                "leased": self._total - idle,
+                "leases": self._leases,
+                "launches": self._launches,
+                "launch_failures": self._launch_failures,
+                "wait_seconds_total": round(self._wait_seconds_total, 3),
+                "wait_seconds_max": round(self._wait_seconds_max, 3),
+                "wait_seconds_avg": round(self._wait_seconds_total / self._leases, 3) if self._leases else 0.0,
+                "recycles": dict(self._recycles),
+            }
+
+    def _acquire(self, timeout):
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("O pool de navegadores foi fechado")
+                if self._idle:
+                    scraper = self._idle.pop()
+                    break
+                if self._total < self.size:
+                    self._total += 1
+                    scraper = None  # Vaga livre: o navegador é iniciado fora do lock
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"Nenhum navegador livre após {timeout}s")
+                self._cond.wait(remaining)
+
+            waited = time.monotonic() - started
+            self._leases += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        if scraper is not None and not scraper.is_alive():
+            self._count_recycle("unhealthy")
+            self._quit(scraper)
+            scraper = None
+
+        if scraper is None:
+            try:
+                scraper = self._launch()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+
+        scraper.lease_count += 1
+        return scraper
+
+    def _release(self, scraper, crashed=False):
+        reason = None
+        if crashed:
+            reason = "crashed"
+        elif scraper.lease_count >= self.max_uses:
+            reason = "max_uses"
+        else:
+            try:
+                scraper.reset()
+            except Exception:
+                reason = "reset_failed"
+
+        if reason is not None:
+            self._count_recycle(reason)
+            self._quit(scraper)
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._total -= 1
+            else:
+                self._idle.append(scraper)
+                self._cond.notify()
+                return
+        self._quit(scraper)
+
+    def _launch(self):
+        try:
+            scraper = self.factory()
+        except Exception:
+            with self._cond:
+                self._launch_failures += 1
+            raise
+        with self._cond:
+            self._launches += 1
+        return scraper
+
+    def _count_recycle(self, reason):
+        with self._cond:
+            self._recycles[reason] += 1
+
+    @staticmethod
+    def _quit(scraper):
+        try:
+            scraper.__exit__(None, None, None)
+        except Exception:
+            pass
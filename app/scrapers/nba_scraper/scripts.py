@@ -0,0 +1,83 @@
+# Scripts JavaScript injetados na página de programação da NBA.
+# Os seletores CSS espelham os XPaths usados pelos métodos de `NbaScraper`
+# (`contains(@class, 'X')` equivale a `[class*='X']`).
+
+# Extrai a programação inteira do mês em uma única ida e volta ao WebDriver.
+# Retorna uma lista de dias no formato:
+#   {"date": "Friday, March 15", "games": [{"status_text", "broadcaster", "teams", "scores", "location"}]}
+# Campos obrigatórios ausentes voltam como null e são tratados em `parsing.build_games`.
+# Com um argumento (um título como "Friday, March 15" ou uma lista de títulos), apenas
+# esses dias são lidos, e a busca para assim que todos forem encontrados.
+EXTRACT_SCHEDULE_JS = """
+const text = (el) => (el ? (el.innerText || '').trim() : null);
+const only = arguments.length && arguments[0]
+    ? new Set([].concat(arguments[0]).map((heading) => heading.toLowerCase()))
+    : null;
+const days = [];
+for (const day of document.querySelectorAll("div[class*='ScheduleDay_sd_']")) {
+    const dateEl = day.querySelector("h4[class*='ScheduleDay_sdDay']");
+    if (only) {
+        const heading = dateEl ? dateEl.textContent.trim().toLowerCase() : null;
+        if (!only.has(heading)) {
+            continue;
+        }
+        only.delete(heading);
+    }
+    const gamesEl = day.querySelector("div[class*='ScheduleDay_sdGames']");
+    const games = [];
+    if (gamesEl) {
+        for (const game of gamesEl.children) {
+            if (game.tagName !== 'DIV' || !(game.getAttribute('class') || '').includes('ScheduleGame')) {
+                continue;
+            }
+
+            let broadcaster = null;
+            const broadcastersEl = game.querySelector("div[class*='Broadcasters']");
+            if (broadcastersEl) {
+                const broadcasterEl = broadcastersEl.querySelector("p[class*='Broadcaster']");
+                broadcaster = broadcasterEl ? text(broadcasterEl) : 'NBA League Pass';
+            }
+
+            const teams = Array.from(game.querySelectorAll("div[class*='ScheduleGame_sgTeam']"))
+                .map((team) => text(team.querySelector('a')));
+            const scores = Array.from(game.querySelectorAll("div[class*='ScheduleGame_sgScore']"))
+                .map((score) => text(score.querySelector('span')));
+
+            const locationEl = game.querySelector("div[class*='ScheduleGame_sgLocationInner']");
+            const location = locationEl
+                ? Array.from(locationEl.querySelectorAll('div')).map((div) => div.textContent)
+                : null;
+
+            games.push({
+                status_text: text(game.querySelector("span[class*='ScheduleStatusText']")),
+                broadcaster: broadcaster,
+                teams: teams,
+                scores: scores,
+                location: location,
+            });
+        }
+    }
+    days.push({date: dateEl ? dateEl.textContent : null, games: games});
+    if (only && only.size === 0) {
+        break;
+    }
+}
+return days;
+"""
+
+# Índice dos dias da página em uma única ida e volta: pares [elemento do dia, título].
+SCHEDULE_INDEX_JS = """
+return Array.from(document.querySelectorAll("div[class*='ScheduleDay_sd_']")).map((day) => {
+    const dateEl = day.querySelector("h4[class*='ScheduleDay_sdDay']");
+    return [day, dateEl ? dateEl.textContent : null];
+});
+"""
+
+# Snapshot barato do estado de renderização da página, usado por `NbaScraper.wait_for_schedule`.
+SCHEDULE_READINESS_JS = """
+return {
+    ready_state: document.readyState,
+    days: document.querySelectorAll("div[class*='ScheduleDay_sd_']").length,
+    games: document.querySelectorAll("div[class*='ScheduleDay_sdGames'] > div[class*='ScheduleGame']").length,
+};
+"""
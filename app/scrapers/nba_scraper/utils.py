@@ -127,4 +127,67 @@ def format_game_time(game_time):
     if period == "PM":
         game_time = game_time + timedelta(hours=12)
     game_time = game_time - timedelta(hours=3)  # Ajusta o horário para UTC-3 (Horário de Brasília)
-    return game_time.strftime("%H:%M")
\ No newline at end of file
+    return game_time.strftime("%H:%M")
+
+def schedule_day_heading(date_str):
+    """
+    Monta o título de um dia como aparece na página de programação.
+
+    Parâmetros:
+        date_str (str): Data no formato "YYYY-MM-DD".
+
+    Retorno:
+        str: Título no formato "Day, Month DD" (exemplo: "Friday, March 15").
+    """
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    return f"{date_obj:%A}, {date_obj:%B} {date_obj.day}"
+
+class DateResolver:
+    """
+    Converte os títulos dos dias de uma página ("Friday, March 15") em "YYYY-MM-DD",
+    como `format_date`, mas consultando o relógio uma única vez e deduzindo o ano
+    pelo dia da semana só no primeiro dia de cada mês: os outros dias do mesmo mês
+    reaproveitam o ano.
+    """
+
+    def __init__(self, timezone=None):
+        """
+        Parâmetros:
+            timezone (datetime.tzinfo, opcional): Fuso horário para considerar o ano corretamente.
+        """
+        self.year = datetime.now(tz=timezone).year
+        self._years = {}  # número do mês -> ano deduzido
+        self._dates = {}  # título -> "YYYY-MM-DD"
+
+    def resolve(self, input_date):
+        """
+        Parâmetros:
+            input_date (str): Data no formato "Day, Month DD" (exemplo: "Friday, March 15").
+
+        Retorno:
+            str: Data formatada no formato "YYYY-MM-DD".
+        """
+        full_date = self._dates.get(input_date)
+        if full_date is not None:
+            return full_date
+        try:
+            day_of_week, date_string = (part.strip() for part in input_date.split(', ')[:2])
+            month_name, day = date_string.split(' ')
+            day = int(day.strip())
+
+            month = month_name_to_num(month_name)
+            if month is None:
+                raise ValueError(f"Nome do mês inválido: {month_name}")
+        except ValueError as e:
+            raise ValueError(f"Erro ao processar data '{input_date}': {e}")
+
+        year = self._years.get(month)
+        if year is None:
+            # Mesma regra de `format_date`: se o dia da semana não bate com o ano atual, é o ano anterior
+            year = self.year
+            if get_day_of_week_from_date_string(f"{year:04d}-{month:02d}-{day:02d}") != day_of_week:
+                year -= 1
+            self._years[month] = year
+
+        full_date = self._dates[input_date] = f"{year:04d}-{month:02d}-{day:02d}"
+        return full_date
@@ -1,6 +1,10 @@
-from pydantic import ValidationError
-from typing import Optional
+from pydantic import TypeAdapter, ValidationError
+from typing import Dict, Optional, Tuple
 from scrapers.models.game import Game
+from metrics import INVALID_GAMES
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Validate game function
 def validate_game(game_data: dict) -> Optional[Game]:
@@ -14,5 +18,41 @@ def validate_game(game_data: dict) -> Optional[Game]:
         return game
     except ValidationError as e:
         # Handle validation errors
-        print(f"Validation error: {e}")
-        return None
\ No newline at end of file
+        INVALID_GAMES.inc()
+        logger.warning("Validation error: %s", e)
+        return None
+
+# Validates a whole list of games with a single adapter call
+GAME_LIST_ADAPTER = TypeAdapter(list[Game])
+
+
+def validate_games(games_data: list) -> Tuple[list, Dict[int, list]]:
+    """
+    Validates a list of games against the Game model in one batch.
+    Returns the validated games (as dicts, with the model's types) and the errors
+    of each rejected game, keyed by its index in `games_data`.
+
+    Dicts rather than models are returned because every consumer works on dicts: the
+    schedule cache, the SQLite store, job results, the live diff and the `fields`
+    projection in `responses`, which then encodes them with pydantic-core.
+    """
+    try:
+        games = GAME_LIST_ADAPTER.validate_python(games_data)
+        return [game.model_dump() for game in games], {}
+    except ValidationError:
+        pass
+
+    # Some game is invalid: only now validate one by one, keeping the valid ones in order
+    valid, errors = [], {}
+    for index, game_data in enumerate(games_data):
+        try:
+            valid.append(Game.model_validate(game_data).model_dump())
+        except ValidationError as e:
+            errors[index] = [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+                for error in e.errors()
+            ]
+            logger.warning("Validation error for game %d (%s): %s", index, game_data, "; ".join(errors[index]))
+
+    INVALID_GAMES.inc(len(errors))
+    return valid, errors
@@ -0,0 +1,308 @@
+from storage.schedule_cache import day_ttl, FINAL_TTL, TODAY_TTL, FUTURE_TTL
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import time
+import os
+
+GAME_COLUMNS = ("game_id", "full_date", "game_time", "broadcaster", "home_team", "away_team",
+                "home_team_score", "away_team_score", "arena", "city", "state")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    full_date TEXT NOT NULL,
+    game_time TEXT NOT NULL,
+    broadcaster TEXT,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_team_score INTEGER,
+    away_team_score INTEGER,
+    arena TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_full_date ON games (full_date);
+CREATE INDEX IF NOT EXISTS idx_games_home_team ON games (home_team);
+CREATE INDEX IF NOT EXISTS idx_games_away_team ON games (away_team);
+CREATE TABLE IF NOT EXISTS months (
+    month TEXT PRIMARY KEY,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    month TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_UPSERT = f"""
+INSERT INTO games ({", ".join(GAME_COLUMNS)}, updated_at)
+VALUES ({", ".join("?" for _ in GAME_COLUMNS)}, ?)
+ON CONFLICT (game_id) DO UPDATE SET
+    {", ".join(f"{column} = excluded.{column}" for column in GAME_COLUMNS[1:])},
+    updated_at = excluded.updated_at
+"""
+
+
+class GameStore:
+    """
+    Armazena os jogos validados em SQLite, com upsert por `game_id`.
+
+    Guarda também quando a página de cada mês foi raspada pela última vez, para
+    que a decisão de servir os dados do banco ou raspar de novo seja barata.
+    A validade de cada dia segue a mesma regra de `schedule_cache.day_ttl`.
+
+    Como o arquivo é compartilhado por todos os workers, ele também guarda as
+    concessões (`leases`) por mês: só o worker com a concessão raspa o mês, e os
+    outros esperam o resultado aparecer no banco. O estado dos jobs de raspagem
+    (`jobs`) também fica aqui, para que qualquer worker responda por eles.
+    """
+
+    def __init__(self, path, timezone=None, final_ttl=FINAL_TTL, today_ttl=TODAY_TTL, future_ttl=FUTURE_TTL):
+        """
+        Args:
+            path (str): Caminho do arquivo SQLite (criado se não existir).
+            timezone (datetime.tzinfo, opcional): Fuso usado para decidir qual é o dia de hoje.
+            final_ttl, today_ttl, future_ttl (float): Tempos de validade, em segundos.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.timezone = timezone
+        self.final_ttl = final_ttl
+        self.today_ttl = today_ttl
+        self.future_ttl = future_ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self.hits = 0
+        self.misses = 0
+        self.leases_acquired = 0
+        self.leases_waited = 0
+
+    def upsert_month(self, month, games_by_date, scraped_at=None):
+        """
+        Grava os jogos raspados da página de um mês e marca o mês como atualizado.
+
+        Jogos que sumiram de um dia raspado (por ex: jogo remarcado) são removidos.
+
+        Args:
+            month (str): Nome do mês da página (por ex: "March").
+            games_by_date (dict): Mapeia "YYYY-MM-DD" para a lista de jogos do dia.
+            scraped_at (float, opcional): Momento da raspagem (epoch). Padrão: agora.
+        """
+        scraped_at = scraped_at or time.time()
+        rows = [
+            tuple(game[column] for column in GAME_COLUMNS) + (scraped_at,)
+            for games in games_by_date.values() for game in games
+        ]
+        with self._lock, self._conn:
+            for full_date, games in games_by_date.items():
+                game_ids = [game["game_id"] for game in games]
+                self._conn.execute(
+                    f"DELETE FROM games WHERE full_date = ? AND game_id NOT IN ({', '.join('?' for _ in game_ids)})",
+                    (full_date, *game_ids),
+                )
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.execute(
+                "INSERT INTO months (month, scraped_at) VALUES (?, ?) "
+                "ON CONFLICT (month) DO UPDATE SET scraped_at = excluded.scraped_at",
+                (month, scraped_at),
+            )
+
+    def month_scraped_at(self, month):
+        """Retorna quando a página do mês foi raspada pela última vez (epoch), ou None."""
+        with self._lock:
+            row = self._conn.execute("SELECT scraped_at FROM months WHERE month = ?", (month,)).fetchone()
+        return row["scraped_at"] if row else None
+
+    def get_month_games(self, month):
+        """
+        Retorna os jogos gravados na última raspagem da página de um mês.
+
+        Args:
+            month (str): Nome do mês da página (por ex: "March").
+
+        Returns:
+            dict: Mapeia "YYYY-MM-DD" para os jogos do dia (dias sem jogos não aparecem).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(GAME_COLUMNS)} FROM games "
+                "WHERE updated_at = (SELECT scraped_at FROM months WHERE month = ?) ORDER BY rowid",
+                (month,),
+            ).fetchall()
+        games_by_date = {}
+        for row in rows:
+            games_by_date.setdefault(row["full_date"], []).append(dict(row))
+        return games_by_date
+
+    def acquire_lease(self, month, owner, ttl):
+        """
+        Tenta obter a concessão de raspagem de um mês, entre todos os processos.
+
+        Args:
+            month (str): Nome do mês da página.
+            owner (str): Identificador do worker (por ex: "host:pid").
+            ttl (float): Validade da concessão, em segundos. Se o worker morrer, outro
+                pode assumir o mês depois desse tempo.
+
+        Returns:
+            bool: True se a concessão é deste worker.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (month, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (month) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (month, owner, now + ttl, now),
+            )
+            acquired = cursor.rowcount == 1
+            if acquired:
+                self.leases_acquired += 1
+            return acquired
+
+    def release_lease(self, month, owner):
+        """Libera a concessão do mês, se ainda for deste worker."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leases WHERE month = ? AND owner = ?", (month, owner))
+
+    def wait_for_month(self, month, since, timeout, poll_interval=0.25):
+        """
+        Espera outro worker gravar o mês ou liberar a concessão.
+
+        Args:
+            month (str): Nome do mês da página.
+            since (float): Só conta uma raspagem gravada depois deste momento (epoch).
+            timeout (float): Tempo máximo de espera, em segundos.
+            poll_interval (float): Intervalo entre consultas ao banco, em segundos.
+
+        Returns:
+            bool: True se o mês foi gravado; False se a concessão foi liberada (ou
+            expirou) sem resultado, ou se o tempo acabou.
+        """
+        with self._lock:
+            self.leases_waited += 1
+        deadline = time.monotonic() + timeout
+        while True:
+            scraped_at = self.month_scraped_at(month)
+            if scraped_at is not None and scraped_at >= since:
+                return True
+            with self._lock:
+                lease = self._conn.execute(
+                    "SELECT expires_at FROM leases WHERE month = ?", (month,)).fetchone()
+            if lease is None or lease["expires_at"] < time.time() or time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def save_job(self, job_id, state):
+        """
+        Grava o estado de um job de raspagem.
+
+        Args:
+            job_id (str): Identificador do job.
+            state (dict): Estado no formato da API (ver `Job.to_dict`).
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (job_id, json.dumps(state), time.time()),
+            )
+
+    def get_job(self, job_id):
+        """Retorna o estado gravado de um job, ou None."""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["state"]) if row else None
+
+    def prune_jobs(self, cutoff):
+        """Remove os jobs sem atualização desde `cutoff` (epoch)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+
+    def get_games(self, date_str, month=None):
+        """
+        Retorna os jogos gravados de uma data, na ordem em que apareciam na página.
+
+        Args:
+            date_str (str): Data no formato "YYYY-MM-DD".
+            month (str, opcional): Nome do mês da página. Se informado, só os jogos da
+                última raspagem desse mês contam: um dia que sumiu da página (por ex: o
+                único jogo foi adiado) volta vazio, como em `get_month_games`.
+
+        Returns:
+            list: Jogos (dicionários) da data.
+        """
+        query = f"SELECT {', '.join(GAME_COLUMNS)} FROM games WHERE full_date = ?"
+        params = (date_str,)
+        if month is not None:
+            query += " AND updated_at = (SELECT scraped_at FROM months WHERE month = ?)"
+            params += (month,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_fresh_games(self, month, dates, count=True):
+        """
+        Retorna os jogos das datas se todos ainda estiverem válidos.
+
+        Args:
+            month (str): Nome do mês da página (por ex: "March").
+            dates (list): Datas no formato "YYYY-MM-DD", todas do mesmo mês.
+            count (bool): Conta a busca nos acertos e faltas.
+
+        Returns:
+            dict | None: Mapeia cada data para seus jogos, ou None se o mês nunca foi
+            raspado ou alguma das datas já expirou.
+        """
+        scraped_at = self.month_scraped_at(month)
+        if scraped_at is not None:
+            age = time.time() - scraped_at
+            today = datetime.now(tz=self.timezone).strftime("%Y-%m-%d")
+            games_by_date = {}
+            for date_str in dates:
+                games = self.get_games(date_str, month)
+                if age >= day_ttl(date_str, games, today, self.final_ttl, self.today_ttl, self.future_ttl):
+                    break
+                games_by_date[date_str] = games
+            else:
+                with self._lock:
+                    self.hits += count
+                return games_by_date
+        with self._lock:
+            self.misses += count
+        return None
+
+    def stats(self):
+        """
+        Retorna as métricas do banco.
+
+        Returns:
+            dict: Número de jogos e meses gravados, acertos e faltas.
+        """
+        with self._lock:
+            games = self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+            months = self._conn.execute("SELECT COUNT(*) FROM months").fetchone()[0]
+            return {"path": self.path, "games": games, "months": months, "hits": self.hits, "misses": self.misses,
+                    "leases_acquired": self.leases_acquired, "leases_waited": self.leases_waited}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import time
+
+# Tempos de expiração padrão, em segundos
+FINAL_TTL = 7 * 24 * 60 * 60  # Dias passados com todos os jogos encerrados ("FINAL") não mudam mais
+TODAY_TTL = 60  # Jogos de hoje mudam de horário/placar a todo momento
+FUTURE_TTL = 30 * 60  # Jogos futuros raramente mudam (emissora, horário)
+
+
+def is_final(games):
+    """Indica se todos os jogos do dia já terminaram (status contém "FINAL", ver `format_game_time`)."""
+    return all("FINAL" in game["game_time"] for game in games)
+
+
+def day_ttl(full_date, games, today, final_ttl=FINAL_TTL, today_ttl=TODAY_TTL, future_ttl=FUTURE_TTL):
+    """
+    Calcula por quanto tempo os jogos de um dia podem ser servidos do cache.
+
+    Parâmetros:
+        full_date (str): Data do dia no formato "YYYY-MM-DD".
+        games (list): Jogos do dia (dias sem jogos são listas vazias).
+        today (str): Data de hoje no formato "YYYY-MM-DD".
+
+    Retorno:
+        float: Tempo de vida em segundos.
+    """
+    if full_date < today:
+        # Dias passados com jogos ainda não encerrados (adiados, atrasados) usam o TTL curto
+        return final_ttl if is_final(games) else today_ttl
+    if full_date == today:
+        return today_ttl
+    return future_ttl
+
+
+class ScheduleCache:
+    """
+    Cache em memória da programação, indexado por mês.
+
+    Uma raspagem da página do mês guarda todos os dias encontrados e as datas
+    seguintes do mesmo mês são servidas da memória. Cada dia expira de acordo com
+    `day_ttl`; datas sem jogos na página expiram como um dia sem jogos. O número
+    de meses é limitado e o menos usado recentemente é descartado (LRU).
+    """
+
+    def __init__(self, timezone=None, max_months=12, final_ttl=FINAL_TTL, today_ttl=TODAY_TTL, future_ttl=FUTURE_TTL):
+        """
+        Args:
+            timezone (datetime.tzinfo, opcional): Fuso usado para decidir qual é o dia de hoje.
+            max_months (int): Número máximo de meses guardados.
+            final_ttl, today_ttl, future_ttl (float): Tempos de expiração, em segundos.
+        """
+        self.timezone = timezone
+        self.max_months = max_months
+        self.final_ttl = final_ttl
+        self.today_ttl = today_ttl
+        self.future_ttl = future_ttl
+
+        self._lock = threading.Lock()
+        self._months = OrderedDict()  # mês -> {"scraped_at": float, "days": {data: (jogos, expira_em)}}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _today(self):
+        return datetime.now(tz=self.timezone).strftime("%Y-%m-%d")
+
+    def _ttl(self, full_date, games, today):
+        return day_ttl(full_date, games, today, self.final_ttl, self.today_ttl, self.future_ttl)
+
+    def get(self, month, date_str, count=True):
+        """
+        Busca os jogos de uma data no cache.
+
+        Args:
+            month (str): Nome do mês da página (por ex: "March").
+            date_str (str): Data no formato "YYYY-MM-DD".
+            count (bool): Conta a busca nos acertos e faltas.
+
+        Returns:
+            list | None: Jogos da data, ou None se a data não estiver no cache ou tiver expirado.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._months.get(month)
+            if entry is not None:
+                if date_str in entry["days"]:
+                    games, expires_at = entry["days"][date_str]
+                else:
+                    # A página não listou essa data: não há jogos nela
+                    games = []
+                    expires_at = entry["scraped_at"] + self._ttl(date_str, games, self._today())
+                if now < expires_at:
+                    self._months.move_to_end(month)
+                    self.hits += count
+                    return games
+            self.misses += count
+            return None
+
+    def put_month(self, month, games_by_date, age=0.0):
+        """
+        Guarda todos os dias raspados da página de um mês.
+
+        Args:
+            month (str): Nome do mês da página (por ex: "March").
+            games_by_date (dict): Mapeia "YYYY-MM-DD" para a lista de jogos do dia.
+            age (float): Há quantos segundos a página foi raspada (por ex: dados lidos do
+                banco), descontados da validade de cada dia.
+        """
+        now = time.monotonic() - age
+        today = self._today()
+        days = {
+            full_date: (games, now + self._ttl(full_date, games, today))
+            for full_date, games in games_by_date.items()
+        }
+        with self._lock:
+            self._months[month] = {"scraped_at": now, "days": days}
+            self._months.move_to_end(month)
+            while len(self._months) > self.max_months:
+                self._months.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Retorna as métricas do cache.
+
+        Returns:
+            dict: Meses guardados, acertos, faltas e descartes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "months": len(self._months),
+                "max_months": self.max_months,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,347 @@
+"""
+Backfill de uma temporada inteira para um dataset colunar (Parquet ou CSV).
+
+Cada mês da temporada (outubro a junho) é raspado uma única vez com
+`scrape_nba_month`, com vários navegadores em paralelo, validado pelo modelo
+`Game` e gravado em um arquivo por mês (`YYYY-MM.parquet` ou `YYYY-MM.csv`) no
+diretório de saída. O dataset inteiro é lido com `pandas.read_parquet(diretório)`.
+
+A nba.com só mostra a programação da temporada atual, então outras temporadas são
+recusadas antes de abrir qualquer navegador.
+
+O `manifest.json` do diretório guarda, por mês, quantos jogos foram gravados e se
+o mês está completo: todos os dias já passaram e todos os jogos estão encerrados
+("FINAL"). Uma nova execução pula os meses completos e raspa de novo só os
+demais, então pode ser interrompida e retomada a qualquer momento.
+
+Uso (a partir do diretório `app`):
+    python -m tasks.backfill 2026-27 --output-dir data/2026-27
+    python -m tasks.backfill 2026-27 --format csv --workers 4 --mode feed
+    python -m tasks.backfill 2026 --force          # raspa de novo até os meses completos
+"""
+from storage.schedule_cache import is_final
+from tasks.scraper_task import DEFAULT_DEADLINE_SECONDS
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import scrapers.nba_scraper.constants as const
+import argparse
+import calendar
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Meses de uma temporada: outubro a dezembro do primeiro ano, janeiro a junho do segundo
+SEASON_MONTHS = (10, 11, 12, 1, 2, 3, 4, 5, 6)
+FORMATS = ("parquet", "csv")
+MANIFEST_NAME = "manifest.json"
+
+# Tipos das colunas do dataset (ver `scrapers.models.game.Game`)
+COLUMN_DTYPES = {
+    "game_id": "string",
+    "full_date": "datetime64[ns]",
+    "game_time": "string",
+    "broadcaster": "string",
+    "home_team": "category",
+    "away_team": "category",
+    "home_team_score": "Int16",
+    "away_team_score": "Int16",
+    "arena": "string",
+    "city": "string",
+    "state": "string",
+}
+
+
+def season_start_year(season):
+    """
+    Lê o ano de início de uma temporada.
+
+    Parâmetros:
+        season (str): Temporada no formato "2024-25" (ou só o ano de início, "2024").
+
+    Retorno:
+        int: Ano de início (por ex: 2024).
+
+    Raises:
+        ValueError: Se o texto não for uma temporada válida.
+    """
+    start, _, end = season.partition("-")
+    valid = start.isdigit() and len(start) == 4
+    if valid and end:
+        valid = end.isdigit() and int(end) % 100 == (int(start) + 1) % 100
+    if not valid:
+        raise ValueError(f"Temporada inválida: {season} (use por ex: 2024-25)")
+    return int(start)
+
+
+def check_current_season(season, today):
+    """
+    Recusa temporadas que não são a atual, já que a nba.com só mostra a programação dela.
+
+    Parâmetros:
+        season (str): Temporada pedida.
+        today (date): Data de hoje (a temporada começa em outubro).
+
+    Raises:
+        ValueError: Se a temporada for inválida ou não for a atual.
+    """
+    current = today.year if today.month >= SEASON_MONTHS[0] else today.year - 1
+    if season_start_year(season) != current:
+        raise ValueError(f"A nba.com só mostra a temporada atual ({current}-{(current + 1) % 100:02d}); "
+                         f"a temporada {season} não pode ser raspada")
+
+
+def season_months(season):
+    """
+    Lista os meses de uma temporada.
+
+    Parâmetros:
+        season (str): Temporada no formato "2024-25" (ou só o ano de início, "2024").
+
+    Retorno:
+        list: Tuplas (ano, mês) de outubro do primeiro ano a junho do seguinte.
+    """
+    start_year = season_start_year(season)
+    return [(start_year if month >= 10 else start_year + 1, month) for month in SEASON_MONTHS]
+
+
+def month_key(year, month):
+    return f"{year:04d}-{month:02d}"
+
+
+def month_is_complete(year, month, games_by_date, today):
+    """
+    Indica se um mês não vai mais mudar: o último dia já passou e todos os jogos terminaram.
+
+    Parâmetros:
+        year, month (int): Mês raspado.
+        games_by_date (dict): "YYYY-MM-DD" -> jogos do mês.
+        today (str): Data de hoje no formato "YYYY-MM-DD".
+
+    Retorno:
+        bool: True se o mês pode ser pulado nas próximas execuções.
+    """
+    last_day = f"{month_key(year, month)}-{calendar.monthrange(year, month)[1]:02d}"
+    if last_day >= today or not games_by_date:
+        return False
+    return all(is_final(games) for games in games_by_date.values())
+
+
+def games_frame(games):
+    """
+    Monta o DataFrame tipado de uma lista de jogos validados.
+
+    Parâmetros:
+        games (list): Dicionários no formato do modelo `Game`.
+
+    Retorno:
+        pandas.DataFrame: Uma linha por jogo, colunas com os tipos de `COLUMN_DTYPES`.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(games, columns=list(COLUMN_DTYPES))
+    frame["full_date"] = pd.to_datetime(frame["full_date"], format="%Y-%m-%d")
+    return frame.astype(COLUMN_DTYPES).sort_values(["full_date", "game_id"], ignore_index=True)
+
+
+class SeasonDataset:
+    """
+    Diretório com um arquivo por mês da temporada e o `manifest.json` dos meses gravados.
+
+    As gravações são atômicas (arquivo temporário + `os.replace`) e o manifest é
+    regravado a cada mês concluído, para que uma execução interrompida não perca
+    os meses já gravados.
+    """
+
+    def __init__(self, directory, format="parquet"):
+        """
+        Args:
+            directory (str): Diretório do dataset (criado se não existir).
+            format (str): "parquet" ou "csv".
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Formato inválido: {format}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = format
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.{self.format}")
+
+    def is_complete(self, key):
+        """Indica se o mês já foi gravado completo, neste formato, e o arquivo ainda existe."""
+        with self._lock:
+            entry = self.manifest.get(key)
+        return bool(entry and entry["complete"] and entry.get("format") == self.format
+                    and os.path.exists(self.path(key)))
+
+    def write_month(self, key, games, complete):
+        """
+        Grava os jogos de um mês e atualiza o manifest.
+
+        Parâmetros:
+            key (str): Mês no formato "YYYY-MM".
+            games (list): Jogos validados do mês.
+            complete (bool): Se o mês pode ser pulado nas próximas execuções.
+        """
+        frame = games_frame(games)
+        path = self.path(key)
+        tmp_path = path + ".tmp"
+        if self.format == "parquet":
+            frame.to_parquet(tmp_path, index=False)
+        else:
+            frame.to_csv(tmp_path, index=False, date_format="%Y-%m-%d")
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.manifest[key] = {"games": len(games), "complete": complete, "format": self.format,
+                                  "scraped_at": time.time()}
+            manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+            with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+                f.write("\n")
+            os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def backfill_season(season, dataset, pool=None, workers=2, extraction_mode="script", deadline_seconds=None,
+                    load_profile=None, force=False, timezone=None):
+    """
+    Raspa os meses da temporada ainda não completos e grava cada um no dataset.
+
+    Args:
+        season (str): Temporada no formato "2024-25".
+        dataset (SeasonDataset): Destino dos meses raspados.
+        pool (BrowserPool, opcional): Pool com `workers` navegadores. Sem pool, cada mês
+            inicia e fecha o próprio `NbaScraper`.
+        workers (int): Meses raspados ao mesmo tempo.
+        extraction_mode (str): Ver `scrape_nba_task`.
+        deadline_seconds (float, opcional): Prazo de cada mês. Padrão: `DEFAULT_DEADLINE_SECONDS`.
+        load_profile (LoadProfile, opcional): Perfil dos navegadores iniciados sem pool.
+        force (bool): Raspa de novo também os meses completos.
+        timezone (datetime.tzinfo, opcional): Fuso usado para decidir qual é o dia de hoje.
+
+    Returns:
+        dict: Meses raspados, pulados e com erro, total de jogos, duração e jogos por segundo.
+
+    Raises:
+        ValueError: Se a temporada for inválida ou não for a temporada atual.
+    """
+    from tasks.scraper_task import scrape_nba_month
+    from tasks.timing import Deadline
+
+    now = datetime.now(tz=timezone)
+    check_current_season(season, now.date())
+    today = now.strftime("%Y-%m-%d")
+
+    pending = []
+    summary = {"season": season, "scraped": {}, "skipped": [], "failed": {}, "games": 0}
+    for year, month in season_months(season):
+        key = month_key(year, month)
+        if key > today[:7]:
+            continue  # Meses que ainda não começaram não têm o que guardar
+        if not force and dataset.is_complete(key):
+            summary["skipped"].append(key)
+        else:
+            pending.append((year, month))
+
+    def scrape(year, month):
+        key = month_key(year, month)
+        started = time.perf_counter()
+        games_by_date = scrape_nba_month(month, pool=pool, extraction_mode=extraction_mode, load_profile=load_profile,
+                                         deadline=Deadline(deadline_seconds or DEFAULT_DEADLINE_SECONDS))
+        # Dias de outros meses que a página possa listar ficam de fora do arquivo do mês
+        games_by_date = {full_date: games for full_date, games in games_by_date.items() if full_date[:7] == key}
+        games = [game for games in games_by_date.values() for game in games]
+        complete = month_is_complete(year, month, games_by_date, today)
+        dataset.write_month(key, games, complete)
+        return len(games), complete, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(scrape, year, month): month_key(year, month) for year, month in pending}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                games, complete, seconds = future.result()
+            except Exception as e:
+                logger.warning("Erro ao raspar %s: %s", key, e)
+                summary["failed"][key] = str(e)
+                continue
+            summary["scraped"][key] = {"games": games, "complete": complete, "seconds": round(seconds, 2)}
+            summary["games"] += games
+            logger.info("%s: %d jogos em %.1fs%s", key, games, seconds, " (completo)" if complete else "")
+
+    elapsed = time.perf_counter() - started
+    summary["seconds"] = round(elapsed, 2)
+    summary["games_per_second"] = round(summary["games"] / elapsed, 2) if elapsed > 0 else 0.0
+    return summary
+
+
+def _season_arg(value):
+    try:
+        season_start_year(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def main(argv=None):
+    from scrapers.nba_scraper.load_profile import LoadProfile
+    from scrapers.nba_scraper.nba_scraper import NbaScraper
+    from scrapers.nba_scraper.pool import BrowserPool
+    from functools import partial
+
+    parser = argparse.ArgumentParser(description="Raspa uma temporada inteira para um dataset Parquet/CSV.")
+    parser.add_argument("season", type=_season_arg, help="Temporada atual, por ex: 2026-27.")
+    parser.add_argument("--output-dir", help="Diretório do dataset. Padrão: data/season_<temporada>.")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Formato dos arquivos. Padrão: parquet.")
+    parser.add_argument("--workers", type=int, default=2, help="Navegadores em paralelo. Padrão: 2.")
+    parser.add_argument("--mode", choices=("script", "html", "elements", "feed"), default="script",
+                        help="Modo de extração. Padrão: script.")
+    parser.add_argument("--load-profile", choices=("lean", "full"), default="lean",
+                        help="Perfil de carregamento do Chrome. Padrão: lean.")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE_SECONDS,
+                        help="Prazo de cada mês, em segundos.")
+    parser.add_argument("--force", action="store_true", help="Raspa de novo também os meses completos.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    timezone = ZoneInfo(const.TIMEZONE)
+    try:
+        check_current_season(args.season, datetime.now(tz=timezone).date())
+    except ValueError as e:
+        parser.error(str(e))  # Sai com código 2 antes de criar o diretório ou abrir o navegador
+
+    dataset = SeasonDataset(args.output_dir or os.path.join("data", f"season_{args.season}"), format=args.format)
+    load_profile = LoadProfile.from_env(args.load_profile)
+    pool = BrowserPool(size=max(1, args.workers), factory=partial(NbaScraper, load_profile=load_profile))
+    try:
+        summary = backfill_season(args.season, dataset, pool=pool, workers=args.workers, extraction_mode=args.mode,
+                                  deadline_seconds=args.deadline, load_profile=load_profile, force=args.force,
+                                  timezone=timezone)
+    finally:
+        pool.close()
+
+    print(json.dumps(summary, indent=2))
+    print(f"{summary['games']} jogos em {summary['seconds']:.1f}s ({summary['games_per_second']:.2f} jogos/s)")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+from concurrent.futures import ThreadPoolExecutor
+from tasks.timing import Deadline, ScrapeTimings
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """A fila de jobs está cheia; o cliente deve tentar novamente mais tarde."""
+
+
+class Job:
+    """Uma raspagem submetida ao `JobManager`."""
+
+    def __init__(self, params, deadline_seconds):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.deadline = Deadline(deadline_seconds)
+        self.timings = ScrapeTimings()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    def to_dict(self):
+        """
+        Retorna o estado do job no formato da API.
+
+        Returns:
+            dict: Identificador, status, parâmetros e, quando terminado, resultado ou erro.
+        """
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            **self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "done":
+            data["result"] = self.result
+        elif self.status == "failed":
+            data["error"] = self.error
+        if self.timings.stages:
+            data["timings"] = self.timings.as_dict()
+        return data
+
+
+class JobManager:
+    """
+    Executa raspagens em um executor limitado, fora das threads do servidor.
+
+    O número de jobs pendentes (na fila ou executando) é limitado a
+    `max_workers + max_queue`; acima disso `submit` levanta `QueueFullError`.
+    Jobs terminados ficam disponíveis para consulta por `result_ttl` segundos.
+
+    Com um `store`, o estado de cada job também é gravado no banco compartilhado
+    a cada mudança de status, para que qualquer worker consiga responder por ele.
+    """
+
+    def __init__(self, max_workers=2, max_queue=20, result_ttl=600, deadline_seconds=45, store=None):
+        """
+        Args:
+            max_workers (int): Raspagens executadas em paralelo.
+            max_queue (int): Jobs que podem esperar na fila além dos que estão executando.
+            result_ttl (float): Tempo, em segundos, que um job terminado fica consultável.
+            deadline_seconds (float): Prazo total de cada job, contado a partir da submissão.
+            store (GameStore, opcional): Banco compartilhado pelos workers onde o estado
+                dos jobs é publicado.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.deadline_seconds = deadline_seconds
+        self.store = store
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._pending = 0
+
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, fn, **params):
+        """
+        Enfileira `fn(job)` para execução.
+
+        Args:
+            fn (callable): Recebe o `Job` e retorna o resultado.
+            **params: Parâmetros do job, expostos em `Job.params` e na API.
+
+        Returns:
+            Job: O job criado.
+
+        Raises:
+            QueueFullError: Se a fila estiver cheia.
+        """
+        with self._lock:
+            self._prune()
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(f"Fila de raspagem cheia ({self._pending} jobs pendentes)")
+            job = Job(params, self.deadline_seconds)
+            self._jobs[job.id] = job
+            self._pending += 1
+            self.submitted += 1
+        self._publish(job)
+        job.future = self._executor.submit(self._run, fn, job)
+        return job
+
+    def get(self, job_id):
+        """Retorna o job com o identificador informado, ou None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_state(self, job_id):
+        """
+        Retorna o estado de um job no formato da API, criado por este worker ou por outro.
+
+        Args:
+            job_id (str): Identificador do job.
+
+        Returns:
+            dict | None: Estado do job (ver `Job.to_dict`), ou None se ele não existir ou já expirou.
+        """
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return self.store.get_job(job_id)
+        return None
+
+    def stats(self):
+        """
+        Retorna as métricas da fila.
+
+        Returns:
+            dict: Capacidade, jobs pendentes e contadores de submissões.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "tracked": len(self._jobs),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "failed": self.failed,
+            }
+
+    def shutdown(self):
+        """Cancela os jobs que ainda não começaram e espera os que estão executando."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, fn, job):
+        job.status = "running"
+        job.started_at = time.time()
+        self._publish(job)
+        try:
+            job.result = fn(job)
+            job.status = "done"
+            return job.result
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+            self._publish(job)
+
+    def _publish(self, job):
+        """Grava o estado do job no banco compartilhado (falhas não interrompem o job)."""
+        if self.store is None:
+            return
+        try:
+            self.store.save_job(job.id, job.to_dict())
+        except Exception as e:
+            logger.warning("Erro ao gravar o job %s no banco: %s", job.id, e)
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store is not None:
+            try:
+                # Jobs sem atualização há `result_ttl` (terminados ou de um worker que morreu)
+                self.store.prune_jobs(cutoff)
+            except Exception as e:
+                logger.warning("Erro ao limpar os jobs do banco: %s", e)
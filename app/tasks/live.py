@@ -0,0 +1,261 @@
+from datetime import datetime
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Campos de um jogo que mudam durante a partida
+LIVE_FIELDS = ("game_time", "home_team_score", "away_team_score")
+
+
+def diff_games(previous, current):
+    """
+    Compara duas leituras do dia e gera só as mudanças.
+
+    Parâmetros:
+        previous (dict): `game_id` -> jogo da leitura anterior.
+        current (dict): `game_id` -> jogo da leitura atual.
+
+    Retorno:
+        list: Eventos `{"type": "add", "game": dict}`, `{"type": "update", "game_id": str,
+        "changes": {campo: valor}}` e `{"type": "remove", "game_id": str}`.
+    """
+    events = []
+    for game_id, game in current.items():
+        before = previous.get(game_id)
+        if before is None:
+            events.append({"type": "add", "game": game})
+            continue
+        changes = {field: game[field] for field in LIVE_FIELDS if game.get(field) != before.get(field)}
+        if changes:
+            events.append({"type": "update", "game_id": game_id, "changes": changes})
+    for game_id in previous.keys() - current.keys():
+        events.append({"type": "remove", "game_id": game_id})
+    return events
+
+
+class LiveSubscriber:
+    """Fila de eventos de um ouvinte, consumida no event loop do próprio ouvinte."""
+
+    def __init__(self, loop, max_events=256):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_events)
+        self.synced = False  # Já recebeu o snapshot do dia
+        self.closed = False
+
+    def push(self, event):
+        """Entrega um evento a partir de qualquer thread (None encerra o stream)."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Ouvinte lento: o stream é encerrado e o cliente reconecta recebendo um snapshot novo
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+        else:
+            if event is None:
+                self.closed = True
+
+
+class LiveScores:
+    """
+    Placar ao vivo dos jogos de hoje com um único navegador.
+
+    Enquanto houver ouvintes, um `NbaScraper` fica estacionado na página do mês
+    atual e relê, a cada `interval`, só o bloco `ScheduleDay` de hoje. As mudanças
+    de placar e status de cada `game_id` são enviadas a todos os ouvintes; quem
+    acabou de se inscrever recebe antes um snapshot do dia. A página é recarregada
+    a cada `reload_interval` (e quando o mês muda), e o navegador é fechado depois
+    de `idle_timeout` segundos sem ouvintes.
+    """
+
+    def __init__(self, factory, timezone=None, interval=1.0, reload_interval=60, idle_timeout=120,
+                 page_timeout=30):
+        """
+        Args:
+            factory (callable): Cria o `NbaScraper` estacionado (com o mesmo perfil do pool).
+            timezone (datetime.tzinfo, opcional): Fuso usado para decidir qual é o dia de hoje.
+            interval (float): Intervalo entre leituras do dia, em segundos.
+            reload_interval (float): Intervalo entre recarregamentos da página, em segundos.
+            idle_timeout (float): Tempo sem ouvintes até o navegador ser fechado, em segundos.
+            page_timeout (float): Tempo máximo para carregar a página, em segundos.
+        """
+        self.factory = factory
+        self.timezone = timezone
+        self.interval = interval
+        self.reload_interval = reload_interval
+        self.idle_timeout = idle_timeout
+        self.page_timeout = page_timeout
+
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._thread = None
+        self._stop = threading.Event()
+        self._date = None
+        self._games = {}
+
+        self.reads = 0
+        self.reloads = 0
+        self.launches = 0
+        self.errors = 0
+        self.events = 0
+        self.last_read_at = None
+
+    def subscribe(self, loop=None):
+        """
+        Registra um ouvinte e liga o navegador se ele estiver parado.
+
+        Args:
+            loop (asyncio.AbstractEventLoop, opcional): Loop que consome os eventos.
+                Padrão: o loop em execução.
+
+        Returns:
+            LiveSubscriber: Ouvinte cujos eventos chegam em `queue`.
+        """
+        subscriber = LiveSubscriber(loop or asyncio.get_running_loop())
+        with self._lock:
+            if self._stop.is_set():
+                raise RuntimeError("O placar ao vivo foi encerrado")
+            self._subscribers.add(subscriber)
+            if self._date is not None:
+                subscriber.push(self._snapshot())
+                subscriber.synced = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-scores", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stop(self, timeout=None):
+        """Encerra os streams e fecha o navegador."""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscriber in subscribers:
+            subscriber.push(None)
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        """
+        Retorna as métricas do placar ao vivo.
+
+        Returns:
+            dict: Ouvintes, estado do navegador e contadores de leituras e eventos.
+        """
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "running": self._thread is not None,
+                "date": self._date,
+                "games": len(self._games),
+                "reads": self.reads,
+                "reloads": self.reloads,
+                "launches": self.launches,
+                "errors": self.errors,
+                "events": self.events,
+                "last_read_at": self.last_read_at,
+            }
+
+    def _snapshot(self):
+        return {"type": "snapshot", "date": self._date, "games": list(self._games.values())}
+
+    def _publish(self, full_date, games):
+        with self._lock:
+            current = {game["game_id"]: game for game in games}
+            if full_date != self._date:
+                self._date, self._games = full_date, current
+                events = [self._snapshot()]  # Virada do dia: todos recomeçam de um snapshot
+            else:
+                events = diff_games(self._games, current)
+                self._games = current
+            self.reads += 1
+            self.last_read_at = datetime.now(tz=self.timezone).isoformat(timespec="seconds")
+            for subscriber in self._subscribers:
+                if not subscriber.synced:
+                    subscriber.push(self._snapshot())
+                    subscriber.synced = True
+                    continue
+                for event in events:
+                    subscriber.push(event)
+            self.events += len(events) * len(self._subscribers)
+
+    def _idle(self, idle_since):
+        """Decide se a thread deve sair; retorna (sair, início da ociosidade)."""
+        with self._lock:
+            if self._stop.is_set():
+                self._thread = None
+                return True, idle_since
+            if self._subscribers:
+                return False, None
+            idle_since = idle_since or time.monotonic()
+            if time.monotonic() - idle_since >= self.idle_timeout:
+                self._thread = None  # Um novo ouvinte passa a iniciar outra thread
+                self._date, self._games = None, {}
+                return True, idle_since
+            return False, idle_since
+
+    def _run(self):
+        from scrapers.nba_scraper.parsing import build_games
+        from scrapers.nba_scraper.utils import month_num_to_name, schedule_day_heading
+        from scrapers.validation.validate_game import validate_games
+        import scrapers.nba_scraper.constants as const
+
+        scraper, page_month, loaded_at, idle_since = None, None, 0.0, None
+        try:
+            while True:
+                done, idle_since = self._idle(idle_since)
+                if done:
+                    return
+
+                today = datetime.now(tz=self.timezone)
+                try:
+                    if scraper is None:
+                        scraper = self.factory()
+                        with self._lock:
+                            self.launches += 1
+                    if page_month != today.month or time.monotonic() - loaded_at >= self.reload_interval:
+                        scraper.set_page_load_timeout(self.page_timeout)
+                        scraper.land_first_page(url=const.BASE_URL.replace("MONTH", month_num_to_name(today.month)))
+                        scraper.wait_for_schedule(timeout=self.page_timeout)
+                        page_month, loaded_at = today.month, time.monotonic()
+                        with self._lock:
+                            self.reloads += 1
+
+                    full_date = today.strftime("%Y-%m-%d")
+                    games_by_date = build_games(scraper.get_schedule_day_data(schedule_day_heading(full_date)),
+                                                timezone=self.timezone, date_str=full_date)
+                    self._publish(full_date, validate_games(games_by_date.get(full_date, []))[0])
+                except Exception as e:
+                    with self._lock:
+                        self.errors += 1
+                    logger.warning("Erro na leitura do placar ao vivo: %s", e)
+                    if scraper is not None:
+                        self._quit(scraper)
+                    scraper, page_month = None, None
+                    self._stop.wait(min(self.reload_interval, 5))
+                    continue
+
+                self._stop.wait(self.interval)
+        finally:
+            if scraper is not None:
+                self._quit(scraper)
+
+    @staticmethod
+    def _quit(scraper):
+        try:
+            scraper.__exit__(None, None, None)
+        except Exception:
+            pass
@@ -0,0 +1,179 @@
+from scrapers.nba_scraper.utils import month_num_to_name
+from datetime import datetime, timedelta
+import calendar
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status de jogo em andamento na página ("Q3 5:32", "HALFTIME", "END Q2", "OT 1:04", "2OT"). Outros
+# status que não são horário ("PPD", "TBD") não contam como jogo ao vivo.
+IN_PROGRESS_STATUS = re.compile(r"^(Q[1-4]|\d*OT|HALF\w*|END|\d(ST|ND|RD|TH) QTR)\b", re.IGNORECASE)
+
+
+def has_live_games(games, now, lead_minutes=30):
+    """
+    Indica se algum jogo do dia está em andamento ou prestes a começar.
+
+    Parâmetros:
+        games (list): Jogos de hoje (dicionários com `game_time`).
+        now (datetime): Horário atual no fuso de `const.TIMEZONE`.
+        lead_minutes (int): Antecedência, em minutos, para considerar um jogo como ao vivo.
+
+    Retorno:
+        bool: True se houver jogo não encerrado que já começou (ou começa em breve).
+    """
+    for game in games:
+        game_time = game["game_time"]
+        if "FINAL" in game_time:
+            continue
+        try:
+            # `format_game_time` já converteu o horário de início para Brasília ("HH:MM")
+            start = datetime.strptime(game_time, "%H:%M").time()
+        except ValueError:
+            if IN_PROGRESS_STATUS.match(game_time.strip()):
+                return True
+            continue  # Adiado, a definir ou outro status que não muda a cada minuto
+        starts_at = datetime.combine(now.date(), start, tzinfo=now.tzinfo)
+        if starts_at - timedelta(minutes=lead_minutes) <= now:
+            return True
+    return False
+
+
+class PrefetchScheduler:
+    """
+    Mantém aquecidos, em segundo plano, os meses mais consultados.
+
+    A cada ciclo o mês atual é raspado de novo (e o mês seguinte, perto do fim do
+    mês). Enquanto houver jogos ao vivo hoje, o intervalo entre ciclos cai para
+    `live_interval`. O resultado é gravado por `refresh`, que escreve no cache e
+    no banco lidos pela API.
+    """
+
+    def __init__(self, refresh, timezone=None, interval=900, live_interval=60, month_end_days=3):
+        """
+        Args:
+            refresh (callable): Recebe o número do mês, raspa e grava; retorna a tupla
+                (dicionário "YYYY-MM-DD" -> jogos, raspou), com raspou False quando o mês
+                foi só lido do banco (já atualizado por outro worker).
+            timezone (datetime.tzinfo, opcional): Fuso usado para decidir qual é o dia de hoje.
+            interval (float): Intervalo normal entre ciclos, em segundos.
+            live_interval (float): Intervalo entre ciclos com jogos ao vivo, em segundos.
+            month_end_days (int): Dias antes do fim do mês em que o mês seguinte também é raspado.
+        """
+        self.refresh = refresh
+        self.timezone = timezone
+        self.interval = interval
+        self.live_interval = live_interval
+        self.month_end_days = month_end_days
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.live = False
+        self.next_run_at = None
+        self.months = {}  # nome do mês -> métricas da última atualização
+
+    def start(self):
+        """Inicia a thread de atualização (o primeiro ciclo roda imediatamente)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="prefetch-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Pede para a thread parar e espera o ciclo atual terminar."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def months_to_refresh(self, today):
+        """
+        Retorna os meses que devem ser raspados no ciclo.
+
+        Args:
+            today (date): Data de hoje.
+
+        Returns:
+            list: Números dos meses (o atual e, perto do fim do mês, o seguinte).
+        """
+        months = [today.month]
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        if days_in_month - today.day < self.month_end_days:
+            months.append(today.month % 12 + 1)
+        return months
+
+    def run_once(self):
+        """
+        Executa um ciclo de atualização.
+
+        Returns:
+            bool: True se houver jogos ao vivo hoje.
+        """
+        now = datetime.now(tz=self.timezone)
+        today = now.strftime("%Y-%m-%d")
+        live = False
+        for month_num in self.months_to_refresh(now.date()):
+            month_name = month_num_to_name(month_num)
+            started = time.monotonic()
+            try:
+                games_by_date, refreshed = self.refresh(month_num)
+            except Exception as e:
+                logger.warning("Erro ao atualizar o mês %s: %s", month_name, e)
+                self._record(month_name, time.monotonic() - started, error=str(e))
+                continue
+            self._record(month_name, time.monotonic() - started, skipped=not refreshed)
+            live = live or has_live_games(games_by_date.get(today, []), now)
+        return live
+
+    def stats(self):
+        """
+        Retorna as métricas do agendador.
+
+        Returns:
+            dict: Estado ao vivo, próximo ciclo e, por mês, duração e idade da última atualização.
+        """
+        now = time.time()
+        with self._lock:
+            months = {}
+            for month_name, info in self.months.items():
+                months[month_name] = dict(info)
+                if info["last_success_at"] is not None:
+                    months[month_name]["staleness_seconds"] = round(now - info["last_success_at"], 1)
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "live": self.live,
+                "interval": self.live_interval if self.live else self.interval,
+                "next_run_in_seconds": round(max(0.0, self.next_run_at - now), 1) if self.next_run_at else None,
+                "months": months,
+            }
+
+    def _record(self, month_name, duration, error=None, skipped=False):
+        with self._lock:
+            info = self.months.setdefault(month_name, {
+                "refreshes": 0, "skipped": 0, "failures": 0, "last_duration_seconds": None,
+                "last_success_at": None, "last_error": None,
+            })
+            info["last_duration_seconds"] = round(duration, 3)
+            if skipped:
+                # Lido do banco: nada foi raspado, então a idade da última atualização continua contando
+                info["skipped"] += 1
+            elif error is None:
+                info["refreshes"] += 1
+                info["last_success_at"] = time.time()
+                info["last_error"] = None
+            else:
+                info["failures"] += 1
+                info["last_error"] = error
+
+    def _run(self):
+        while not self._stop.is_set():
+            live = self.run_once()
+            delay = self.live_interval if live else self.interval
+            with self._lock:
+                self.live = live
+                self.next_run_at = time.time() + delay
+            self._stop.wait(delay)
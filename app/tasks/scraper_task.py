@@ -1,107 +1,321 @@
-def scrape_nba_task(date_str):
-    from scrapers.nba_scraper.nba_scraper import NbaScraper
-    from scrapers.nba_scraper.utils import format_date, generate_game_id, get_month_from_date_string, month_num_to_name
-    from scrapers.validation.validate_game import validate_game
-    from tqdm import tqdm
-    from zoneinfo import ZoneInfo
-    import time
+import logging
 
-    import scrapers.nba_scraper.constants as const
+logger = logging.getLogger(__name__)
 
-    month_num = get_month_from_date_string(date_str)
-    month_name = month_num_to_name(month_num)
-    url = const.BASE_URL.replace("MONTH", month_name)
+# Prazo total padrão de uma raspagem (iniciar navegador, carregar, esperar e extrair), em segundos
+DEFAULT_DEADLINE_SECONDS = 45
+# Trecho da URL do feed JSON procurado no log de rede e tempo máximo esperando por ele
+FEED_URL_FRAGMENT = "scheduleLeagueV2"
+FEED_CAPTURE_TIMEOUT = 10
 
-    print(f"URL being accessed: {url}")  # Debug log
 
-    tz = ZoneInfo(const.TIMEZONE)
-    data = []
-    games_found = False
+def _extract_games_script(scraper, tz, date_str=None):
+    """
+    Extrai os jogos com um único script injetado (uma ida e volta por página). Com
+    `date_str`, o script lê só o bloco daquele dia.
+    """
+    from scrapers.nba_scraper.parsing import build_games
+    from scrapers.nba_scraper.utils import DateResolver, schedule_day_heading
 
-    try:
-        with NbaScraper() as scraper:
-            print("Iniciando o scraper...")
-            scraper.land_first_page(url=url)
-            print("Página inicial acessada com sucesso")
+    if date_str is None:
+        schedule_days = scraper.get_schedule_data()
+    else:
+        schedule_days = scraper.get_schedule_day_data(schedule_day_heading(date_str))
+        if not schedule_days:
+            # Dia sem bloco na página (sem jogos, o caso comum) ou título em outro formato:
+            # o índice dos dias decide, e só no segundo caso a página inteira é lida
+            if date_str not in scraper.get_schedule_index(DateResolver(tz)):
+                return {}
+            logger.warning("Título do dia %s não encontrado na página, lendo a programação inteira", date_str)
+            schedule_days = scraper.get_schedule_data()
+    logger.debug("Dias encontrados na programação: %d", len(schedule_days))
 
-            print("Aguardando 5 segundos para carregar o conteúdo...")
-            time.sleep(5)
-            schedule_days = scraper.get_schedule_days()
-            print(f"Dias encontrados na programação: {len(schedule_days)}")
+    return build_games(schedule_days, timezone=tz, date_str=date_str)
 
-            if not schedule_days:
-                print("Nenhum dia encontrado na programação!")
-                return []
 
-            for schedule_day in tqdm(schedule_days, desc=f"Procurando o dia: {date_str}"):
-                try:
-                    full_date = format_date(scraper.get_schedule_day_date(schedule_day), timezone=tz)
-                    print(f"Data formatada: {full_date}")
+def _extract_games_html(scraper, tz, date_str=None, snapshot_dir=None, month_name=None):
+    """Extrai os jogos de um snapshot do `page_source`, analisado em processo com lxml."""
+    from scrapers.nba_scraper.html_parser import parse_schedule_html
+    from scrapers.nba_scraper.parsing import build_games
+    from datetime import datetime
+    import os
+
+    page_source = scraper.page_source
+    if snapshot_dir:
+        # Guarda o snapshot para poder reprocessá-lo depois sem abrir o Chrome
+        os.makedirs(snapshot_dir, exist_ok=True)
+        # Data (ou mês) no nome e microssegundos, para que meses raspados em paralelo não se sobrescrevam
+        snapshot_path = os.path.join(snapshot_dir,
+                                     f"{date_str or month_name or 'month'}_{datetime.now():%Y%m%d%H%M%S%f}.html")
+        with open(snapshot_path, "w", encoding="utf-8") as f:
+            f.write(page_source)
 
-                    if full_date != date_str:
-                        continue
+    schedule_days = parse_schedule_html(page_source)
+    logger.debug("Dias encontrados na programação: %d", len(schedule_days))
 
-                    games_found = True
-                    schedule_day_games = scraper.get_schedule_day_games(schedule_day)
-                    schedule_games = scraper.get_schedule_games(schedule_day_games)
+    return build_games(schedule_days, timezone=tz, date_str=date_str)
 
-                    print(f"Número de jogos encontrados: {len(schedule_games)}")
 
-                    for schedule_game in tqdm(schedule_games, desc=f"Processando jogos do dia: {date_str}", leave=False):
-                        try:
+def _extract_games_elements(scraper, tz, date_str=None, timings=None):
+    """Extrai os jogos campo a campo, com uma chamada ao WebDriver por elemento."""
+    from scrapers.nba_scraper.parsing import make_game_data, extracting, ExtractionError
+    from scrapers.nba_scraper.utils import DateResolver
+    from tasks.timing import ScrapeTimings
+    from metrics import EXTRACTION_ERRORS
+
+    timings = timings if timings is not None else ScrapeTimings()
+
+    # Índice data -> bloco do dia em uma única ida e volta, para ir direto ao dia pedido
+    with timings.stage("day_scan"):
+        schedule_index = scraper.get_schedule_index(DateResolver(tz))
+    logger.debug("Dias encontrados na programação: %d", len(schedule_index))
+
+    games_by_date = {}
+    if not schedule_index:
+        logger.warning("Nenhum dia encontrado na programação")
+        return games_by_date
+
+    if date_str is not None:
+        schedule_index = {date_str: schedule_index[date_str]} if date_str in schedule_index else {}
+
+    for full_date, schedule_day in schedule_index.items():
+        try:
+            games = games_by_date.setdefault(full_date, [])
+            with timings.stage("day_scan"), extracting("games"):
+                schedule_day_games = scraper.get_schedule_day_games(schedule_day)
+                schedule_games = scraper.get_schedule_games(schedule_day_games)
+
+            logger.debug("Número de jogos encontrados em %s: %d", full_date, len(schedule_games))
+
+            for schedule_game in schedule_games:
+                try:
+                    with timings.stage("game_extraction"):
+                        with extracting("status_text"):
                             game_time = scraper.get_schedule_game_time(schedule_game)
+                        with extracting("broadcaster"):
                             broadcaster = scraper.get_schedule_game_broadcaster(schedule_game)
+                        with extracting("teams"):
                             away_team, home_team = scraper.get_schedule_game_teams(schedule_game)
+                        with extracting("scores"):
                             away_team_score, home_team_score = scraper.get_schedule_game_scores(schedule_game)
+                        with extracting("location"):
                             arena, city, state = scraper.get_schedule_game_location(schedule_game)
 
-                            game_id = generate_game_id(full_date, home_team, away_team)
-                            game_data = {
-                                "game_id": game_id,
-                                "full_date": full_date,
-                                "game_time": game_time,
-                                "broadcaster": broadcaster,
-                                "home_team": home_team,
-                                "away_team": away_team,
-                                "home_team_score": home_team_score,
-                                "away_team_score": away_team_score,
-                                "arena": arena,
-                                "city": city,
-                                "state": state
-                            }
-
-                            validated_game = validate_game(game_data)
-                            if validated_game:
-                                data.append(game_data)
-                                print(f"Jogo adicionado com sucesso: {game_id}")
-                            else:
-                                print(f"Dados inválidos para o jogo: {game_data}")
-                        except Exception as e:
-                            print(f"Erro ao processar jogo individual: {str(e)}")
-                            continue
-                except Exception as e:
-                    print(f"Erro ao processar dia: {str(e)}")
+                    games.append(make_game_data(full_date, game_time, broadcaster, away_team, home_team,
+                                                away_team_score, home_team_score, arena, city, state))
+                except ExtractionError as e:
+                    EXTRACTION_ERRORS.labels(field=e.field).inc()
+                    logger.warning("Erro ao processar jogo individual em %s: %s", full_date, e)
                     continue
+        except ExtractionError as e:
+            EXTRACTION_ERRORS.labels(field=e.field).inc()
+            logger.warning("Erro ao processar dia: %s", e)
+            continue
+    return games_by_date
+
+
+def _validate_games(games):
+    """Valida os jogos em lote com o modelo `Game`, descartando os inválidos (já registrados no log)."""
+    from scrapers.validation.validate_game import validate_games
+
+    return validate_games(games)[0]
+
+
+def _extract_games_feed(feed, tz, month_num, date_str=None):
+    """Converte o feed JSON da temporada nos jogos do mês (sem DOM nem XPath)."""
+    from scrapers.nba_scraper.feed import feed_to_schedule_days
+    from scrapers.nba_scraper.parsing import build_games
+
+    return build_games(feed_to_schedule_days(feed, month_num), timezone=tz, date_str=date_str)
+
+
+def _record_page_load(scraper, month_name, timings):
+    """Guarda em `timings.page_load` a rede usada pela página e exporta nas métricas."""
+    from metrics import PAGE_LOAD_BYTES, BLOCKED_REQUESTS
+
+    try:
+        timings.page_load = scraper.page_load_stats()
+    except Exception as e:
+        logger.warning("Não foi possível ler o log de performance: %s", e)
+        return
+    PAGE_LOAD_BYTES.observe(timings.page_load["bytes"])
+    BLOCKED_REQUESTS.inc(timings.page_load["blocked"])
+    logger.info("Carregamento de %s: %s", month_name, timings.page_load)
+
+
+def _scrape_month_page(month_num, pool=None, extraction_mode="script", snapshot_dir=None, date_str=None,
+                       deadline=None, timings=None, load_profile=None):
+    """
+    Abre a página do mês e extrai os jogos (sem validação).
+
+    No modo "feed", o feed JSON da temporada é baixado direto, sem navegador. Se isso
+    falhar, a página é aberta e o feed é capturado do log de rede do Chrome (a URL
+    capturada passa a ser usada nas próximas chamadas); sem o feed, a extração cai
+    para o modo "script".
+
+    Returns:
+        dict: Mapeia "YYYY-MM-DD" para a lista de jogos daquele dia. Com `date_str`,
+        apenas esse dia é extraído.
+    """
+    from scrapers.nba_scraper.nba_scraper import NbaScraper
+    from scrapers.nba_scraper.utils import month_num_to_name
+    from scrapers.nba_scraper.feed import schedule_feed
+    from selenium.common.exceptions import TimeoutException
+    from tasks.timing import ScrapeTimeoutError, timed_context
+    from zoneinfo import ZoneInfo
+
+    import scrapers.nba_scraper.constants as const
+
+    if extraction_mode not in ("script", "html", "elements", "feed"):
+        raise ValueError(f"Modo de extração inválido: {extraction_mode}")
+
+    month_name = month_num_to_name(month_num)
+    url = const.BASE_URL.replace("MONTH", month_name)
+
+    logger.info("Raspando %s", url)
+
+    tz = ZoneInfo(const.TIMEZONE)
+
+    if extraction_mode == "feed":
+        deadline.check("feed_fetch")
+        try:
+            with timings.stage("feed_fetch"):
+                feed = schedule_feed.fetch(timeout=max(deadline.remaining(), 1))
+            with timings.stage("extraction"):
+                return _extract_games_feed(feed, tz, month_num, date_str=date_str)
+        except Exception as e:
+            logger.warning("Feed indisponível em %s, capturando pela página: %s", schedule_feed.url, e)
+
+    deadline.check("launch")
+    with timings.stage("launch"):
+        browser = (pool.lease(timeout=deadline.remaining()) if pool is not None
+                   else NbaScraper(load_profile=load_profile))
+    with timed_context(browser, timings, "launch", "teardown") as scraper:
+        try:
+            deadline.check("navigation")
+            with timings.stage("navigation"):
+                scraper.set_page_load_timeout(max(deadline.remaining(), 1))
+                scraper.land_first_page(url=url)
+
+            if extraction_mode == "feed" and scraper.reports_page_load():
+                try:
+                    with timings.stage("feed_capture"):
+                        feed_url, feed = scraper.capture_json_response(
+                            FEED_URL_FRAGMENT, timeout=min(FEED_CAPTURE_TIMEOUT, deadline.remaining()))
+                    schedule_feed.remember(feed_url, feed)
+                    _record_page_load(scraper, month_name, timings)
+                    with timings.stage("extraction"):
+                        return _extract_games_feed(feed, tz, month_num, date_str=date_str)
+                except Exception as e:
+                    logger.warning("Feed não capturado na página, usando extração por script: %s", e)
+
+            deadline.check("wait")
+            with timings.stage("wait"):
+                days_found = scraper.wait_for_schedule(timeout=deadline.remaining())
+            logger.debug("Programação pronta (%d dias) em %.2fs", days_found, timings.stages["wait"])
+        except TimeoutException as e:
+            raise ScrapeTimeoutError(f"Prazo de {deadline.seconds}s esgotado ao carregar a página: {e.msg}")
+
+        if scraper.reports_page_load():
+            _record_page_load(scraper, month_name, timings)
+
+        with timings.stage("extraction"):
+            try:
+                if extraction_mode in ("script", "feed"):
+                    return _extract_games_script(scraper, tz, date_str=date_str)
+                if extraction_mode == "html":
+                    return _extract_games_html(scraper, tz, date_str=date_str, snapshot_dir=snapshot_dir,
+                                               month_name=month_name)
+            except Exception as e:
+                logger.warning("Extração via %s falhou, usando extração por elementos: %s", extraction_mode, e)
+            deadline.check("extraction")
+            return _extract_games_elements(scraper, tz, date_str=date_str, timings=timings)
+
 
-        if not games_found:
-            print(f"Nenhum jogo encontrado para a data: {date_str}")
+def scrape_nba_task(date_str, pool=None, extraction_mode="script", snapshot_dir=None, deadline=None, timings=None,
+                    load_profile=None):
+    """
+    Raspa os jogos da NBA de uma data.
+
+    Args:
+        date_str (str): Data no formato "YYYY-MM-DD".
+        pool (BrowserPool, opcional): Pool de navegadores aquecidos. Sem pool, um
+            `NbaScraper` novo é iniciado e fechado só para esta chamada.
+        extraction_mode (str): "script" extrai a página inteira com um único script
+            injetado; "html" analisa um snapshot do `page_source` em processo com lxml;
+            "elements" usa o caminho antigo, um `find_element` por campo; "feed" lê o
+            feed JSON da temporada (direto ou capturado da rede), sem esperar o DOM.
+            Se o modo escolhido falhar, o caminho "elements" é usado como fallback.
+        snapshot_dir (str, opcional): No modo "html", diretório onde o snapshot da
+            página é salvo para ser reprocessado depois.
+        deadline (Deadline, opcional): Prazo total da requisição. Padrão: `DEFAULT_DEADLINE_SECONDS`.
+        timings (ScrapeTimings, opcional): Recebe o tempo gasto em cada etapa e, com um
+            perfil de carregamento enxuto, a rede usada pela página (`page_load`).
+        load_profile (LoadProfile, opcional): Perfil do navegador iniciado quando não há
+            `pool` (o pool já cria os navegadores com o próprio perfil).
+
+    Returns:
+        list: Lista de dicionários com os jogos validados.
+
+    Raises:
+        ScrapeTimeoutError: Se a raspagem não terminar dentro do prazo.
+    """
+    from scrapers.nba_scraper.utils import get_month_from_date_string
+    from tasks.timing import Deadline, ScrapeTimings
+
+    deadline = deadline or Deadline(DEFAULT_DEADLINE_SECONDS)
+    timings = timings if timings is not None else ScrapeTimings()
+
+    try:
+        games_by_date = _scrape_month_page(get_month_from_date_string(date_str), pool=pool,
+                                           extraction_mode=extraction_mode, snapshot_dir=snapshot_dir,
+                                           date_str=date_str, deadline=deadline, timings=timings,
+                                           load_profile=load_profile)
+
+        if date_str not in games_by_date:
+            logger.info("Nenhum jogo encontrado para a data: %s", date_str)
             return []
 
+        with timings.stage("validation"):
+            data = _validate_games(games_by_date[date_str])
         if not data:
-            print(f"Nenhum dado válido encontrado para a data: {date_str}")
+            logger.warning("Nenhum dado válido encontrado para a data: %s", date_str)
             return []
 
-        print(f"Número total de jogos retornados: {len(data)}")
+        logger.info("Jogos retornados para %s: %d", date_str, len(data))
         return data
 
     except Exception as e:
-        print(f"Erro durante a execução do scraper: {str(e)}")
+        logger.exception("Erro durante a execução do scraper: %s", e)
         raise
 
-    finally:
-        # Ensure the scraper is properly closed
-        if scraper:
-            try:
-                scraper.quit()
-            except Exception:
-                pass
\ No newline at end of file
+
+def scrape_nba_month(month_num, pool=None, extraction_mode="script", snapshot_dir=None, deadline=None, timings=None,
+                     load_profile=None):
+    """
+    Raspa todos os jogos da página de um mês.
+
+    Args:
+        month_num (int): Número do mês (1 a 12).
+        pool, extraction_mode, snapshot_dir, deadline, timings, load_profile: Ver `scrape_nba_task`.
+
+    Returns:
+        dict: Mapeia "YYYY-MM-DD" para a lista de jogos validados daquele dia.
+    """
+    from tasks.timing import Deadline, ScrapeTimings
+
+    deadline = deadline or Deadline(DEFAULT_DEADLINE_SECONDS)
+    timings = timings if timings is not None else ScrapeTimings()
+
+    try:
+        games_by_date = _scrape_month_page(month_num, pool=pool, extraction_mode=extraction_mode,
+                                           snapshot_dir=snapshot_dir, deadline=deadline, timings=timings,
+                                           load_profile=load_profile)
+        with timings.stage("validation"):
+            data = {full_date: _validate_games(games) for full_date, games in games_by_date.items()}
+        logger.info("Jogos retornados para o mês %d: %d", month_num, sum(len(games) for games in data.values()))
+        return data
+
+    except Exception as e:
+        logger.exception("Erro durante a execução do scraper: %s", e)
+        raise
@@ -0,0 +1,76 @@
+from concurrent.futures import Future
+import threading
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Enquanto a função de uma chave está em andamento, novas chamadas com essa chave
+    esperam pelo mesmo resultado em vez de executá-la de novo. Erros são repassados
+    para todos que esperavam, e a chave é liberada ao final, de modo que uma falha
+    não contamina as tentativas seguintes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # chave -> Future da execução em andamento
+
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """
+        Executa `fn(*args, **kwargs)` uma única vez por chave em andamento.
+
+        Args:
+            key: Chave que identifica a execução (por ex: o nome do mês).
+            fn (callable): Função a executar.
+            timeout (float, opcional): Tempo máximo que uma chamada agrupada espera
+                pelo resultado de outra.
+
+        Returns:
+            O resultado de `fn`, compartilhado entre todas as chamadas da mesma chave.
+
+        Raises:
+            Exception: A mesma exceção levantada por `fn`.
+            concurrent.futures.TimeoutError: Se a espera exceder `timeout`.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        """
+        Retorna as métricas de agrupamento.
+
+        Returns:
+            dict: Execuções reais, chamadas agrupadas e chaves em andamento.
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
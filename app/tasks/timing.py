@@ -0,0 +1,87 @@
+from metrics import SCRAPE_STAGE_SECONDS
+from contextlib import contextmanager
+import sys
+import time
+
+
+class ScrapeTimeoutError(Exception):
+    """A raspagem estourou o prazo total da requisição."""
+
+
+class Deadline:
+    """Prazo total de uma requisição, compartilhado por todas as etapas da raspagem."""
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds (float): Tempo total disponível, em segundos.
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Segundos restantes até o prazo (nunca negativo)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, stage):
+        """
+        Falha imediatamente se o prazo já acabou.
+
+        Args:
+            stage (str): Etapa em andamento, usada na mensagem de erro.
+
+        Raises:
+            ScrapeTimeoutError: Se não houver mais tempo.
+        """
+        if self.remaining() <= 0:
+            raise ScrapeTimeoutError(f"Prazo de {self.seconds}s esgotado durante a etapa '{stage}'")
+
+
+class ScrapeTimings:
+    """Acumula o tempo gasto em cada etapa de uma requisição."""
+
+    def __init__(self):
+        self.stages = {}
+        self.page_load = None  # Rede usada pela página (ver `NbaScraper.page_load_stats`)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        """Mede o bloco `with` e soma o tempo à etapa `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.add(name, seconds)
+            SCRAPE_STAGE_SECONDS.labels(stage=name).observe(seconds)
+
+    def as_dict(self):
+        return {name: round(seconds, 3) for name, seconds in self.stages.items()}
+
+    def server_timing(self):
+        """Formata as etapas para o cabeçalho HTTP `Server-Timing` (durações em ms)."""
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+
+
+@contextmanager
+def timed_context(manager, timings, enter_stage, exit_stage):
+    """
+    Entra em um context manager medindo a entrada e a saída como etapas separadas
+    (por ex: iniciar e fechar o navegador). Exceções do bloco continuam chegando
+    ao `__exit__` do manager original.
+    """
+    with timings.stage(enter_stage):
+        value = manager.__enter__()
+    try:
+        yield value
+    except BaseException:
+        with timings.stage(exit_stage):
+            suppressed = manager.__exit__(*sys.exc_info())
+        if not suppressed:
+            raise
+    else:
+        with timings.stage(exit_stage):
+            manager.__exit__(None, None, None)